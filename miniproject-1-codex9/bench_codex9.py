@@ -0,0 +1,236 @@
+"""
+=========================================================
+  📈 Codex-9 Scaling Benchmarks
+=========================================================
+
+Measures how the Codex-9 data-structure stages scale with input size,
+using only the standard library (timeit + tracemalloc).
+
+Every benchmark runs on seeded synthetic data, so two runs on the same
+machine see identical inputs:
+    random      uniformly random sizes / IDs / edges
+    sorted      already ascending sizes (worst case for naive quicksort/BST)
+    duplicates  only a handful of distinct values
+    chain       one long dependency chain (worst case for recursive DFS)
+
+By default the scalable engines are measured (introsort_modules,
+IntegrityTree, unique_modules_stream, iter_dfs_activation). Pass
+--target tasks (or all) to measure your own task implementations as well;
+unimplemented tasks are reported with status "unimplemented".
+
+USAGE:
+    python bench_codex9.py --sizes 10000,100000,1000000 --output results.json
+    python bench_codex9.py --sizes 10000,100000 --baseline results.json --tolerance 0.25
+
+With --baseline the run exits with status 1 if any benchmark is slower
+than its baseline time by more than the tolerance.
+
+=========================================================
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+
+import codex9
+
+
+DEFAULT_SIZES = (10_000, 100_000)
+
+
+# =======================================================
+# 🎲 Seeded Synthetic Data Generators
+# =======================================================
+def make_modules(n: int, kind: str, seed: int = 0) -> list:
+    """Returns n (id, size) pairs of the given kind: random, sorted or duplicates."""
+    rng = random.Random(seed)
+    if kind == "random":
+        return [(i, rng.random() * 1000.0) for i in range(n)]
+    if kind == "sorted":
+        return [(i, i / 10.0) for i in range(n)]
+    if kind == "duplicates":
+        return [(i, float(rng.randrange(4))) for i in range(n)]
+    raise ValueError("unknown module kind: %r" % kind)
+
+
+def make_segments(n: int, kind: str, seed: int = 0) -> list:
+    """Returns n (word, id) tuples; 'duplicates' draws them from only n // 10 distinct tuples."""
+    rng = random.Random(seed)
+    distinct = n if kind == "random" else max(1, n // 10)
+    if kind not in ("random", "duplicates"):
+        raise ValueError("unknown segment kind: %r" % kind)
+    ids = [rng.randrange(distinct) for _ in range(n)]
+    return [("w%d" % module_id, module_id) for module_id in ids]
+
+
+def make_graph(n: int, kind: str, seed: int = 0, degree: int = 3) -> dict:
+    """Returns an adjacency dict over n string IDs: 'random' (out-degree `degree`) or 'chain'."""
+    if kind == "chain":
+        graph = {str(i): [str(i + 1)] for i in range(n - 1)}
+        graph[str(n - 1)] = []
+        return graph
+    if kind == "random":
+        rng = random.Random(seed)
+        return {str(i): [str(rng.randrange(n)) for _ in range(degree)] for i in range(n)}
+    raise ValueError("unknown graph kind: %r" % kind)
+
+
+# =======================================================
+# ⏱️ Benchmark Cases
+# =======================================================
+def _build_tree(pairs):
+    tree = codex9.IntegrityTree()
+    for key, value in pairs:
+        tree.insert(key, value)
+    return list(tree)
+
+
+def _build_bst(pairs):
+    root = None
+    for key, value in pairs:
+        root = codex9.insert_bst(root, key, value)
+    return codex9.inorder_bst(root)
+
+
+def _dfs_task(graph):
+    return codex9.dfs_activation(graph, "0")
+
+
+# name -> (datasets, data factory, engine callable, task callable)
+BENCHMARKS = {
+    "quick_sort_modules": (("random", "sorted", "duplicates"), make_modules,
+                           codex9.introsort_modules, codex9.quick_sort_modules),
+    "insert_bst/inorder_bst": (("random", "sorted"), make_modules, _build_tree, _build_bst),
+    "unique_modules": (("random", "duplicates"), make_segments,
+                       lambda data: list(codex9.unique_modules_stream(data)), codex9.unique_modules),
+    "dfs_activation": (("random", "chain"), make_graph,
+                       lambda graph: list(codex9.iter_dfs_activation(graph, ["0"])), _dfs_task),
+}
+
+
+def _measure(function, data, repeat: int, trace_memory: bool) -> dict:
+    """Times function(data) (best of `repeat`) and optionally records its tracemalloc peak."""
+    try:
+        if function(data) is None:
+            return {"status": "unimplemented"}
+        seconds = min(timeit.Timer(lambda: function(data)).repeat(repeat=repeat, number=1))
+        peak = None
+        if trace_memory:
+            tracemalloc.start()
+            try:
+                function(data)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    except (RecursionError, MemoryError) as error:
+        return {"status": "error", "error": type(error).__name__}
+    return {"status": "ok", "seconds": seconds, "peak_bytes": peak}
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, targets=("engine",), names=None,
+                   repeat: int = 3, seed: int = 0, trace_memory: bool = True) -> dict:
+    """
+    Runs every selected benchmark for every size and dataset kind.
+
+    Arguments:
+        sizes (iterable): Input sizes to measure.
+        targets (iterable): 'engine' and/or 'task'.
+        names (iterable): Benchmark names to run (all if None).
+        repeat (int): Timing repetitions; the best one is reported.
+        seed (int): Seed for the synthetic data generators.
+        trace_memory (bool): Also record tracemalloc peak bytes.
+
+    Returns:
+        dict: {'meta': {...}, 'results': [...]} ready to be dumped as JSON.
+    """
+    results = []
+    for name, (datasets, factory, engine, task) in BENCHMARKS.items():
+        if names is not None and name not in names:
+            continue
+        for n in sizes:
+            for kind in datasets:
+                data = factory(n, kind, seed)
+                for target in targets:
+                    function = engine if target == "engine" else task
+                    row = {"bench": name, "target": target, "dataset": kind, "n": n}
+                    row.update(_measure(function, data, repeat, trace_memory))
+                    results.append(row)
+    meta = {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "machine": platform.machine(), "seed": seed, "repeat": repeat}
+    return {"meta": meta, "results": results}
+
+
+def compare_results(current: dict, baseline: dict, tolerance: float = 0.25) -> list:
+    """
+    Lists the benchmarks that got slower than the baseline by more than tolerance.
+
+    Arguments:
+        current (dict): Output of run_benchmarks().
+        baseline (dict): A previously saved run_benchmarks() output.
+        tolerance (float): Allowed relative slowdown (0.25 = 25%).
+
+    Returns:
+        list: One dict per regression with the baseline and current seconds and the ratio.
+    """
+    def key(row):
+        return row["bench"], row["target"], row["dataset"], row["n"]
+
+    reference = {key(row): row for row in baseline.get("results", ()) if row.get("status") == "ok"}
+    regressions = []
+    for row in current["results"]:
+        before = reference.get(key(row))
+        if before is None or row.get("status") != "ok":
+            continue
+        ratio = row["seconds"] / before["seconds"] if before["seconds"] else float("inf")
+        if ratio > 1.0 + tolerance:
+            regressions.append({"bench": row["bench"], "target": row["target"], "dataset": row["dataset"],
+                                "n": row["n"], "baseline": before["seconds"], "current": row["seconds"],
+                                "ratio": ratio})
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Scaling benchmarks for the Codex-9 stages.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated input sizes, e.g. 10000,100000,1000000,10000000")
+    parser.add_argument("--target", choices=("engine", "tasks", "all"), default="engine",
+                        help="measure the engines, your task functions, or both")
+    parser.add_argument("--bench", action="append", choices=sorted(BENCHMARKS),
+                        help="run only this benchmark (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions (best is kept)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the data generators")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc peak measurement")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--baseline", help="compare against a saved JSON result file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    targets = {"engine": ("engine",), "tasks": ("task",), "all": ("engine", "task")}[args.target]
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    current = run_benchmarks(sizes, targets, args.bench, args.repeat, args.seed, not args.no_memory)
+    text = json.dumps(current, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare_results(current, baseline, args.tolerance)
+        for row in regressions:
+            print("REGRESSION %(bench)s [%(target)s/%(dataset)s n=%(n)d]: "
+                  "%(baseline).6fs -> %(current).6fs (x%(ratio).2f)" % row, file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
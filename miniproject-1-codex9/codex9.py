@@ -29,14 +29,230 @@ INSTRUCTIONS:
 =========================================================
 """
 
+from array import array
 from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import asyncio
+import contextlib
+import functools
 import json
 import heapq
+import math
+import mmap
+import os
+import pickle
+import random
+import struct
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zlib
+
+
+# =======================================================
+# 📊 INSTRUMENTATION — Opt-in Per-Task Metrics
+# =======================================================
+# @instrumented only registers a task function. enable_metrics() swaps a
+# measuring wrapper in for each registered module-level name and
+# disable_metrics() puts the original functions back. While metrics are
+# disabled, calls (including recursive ones) therefore run unwrapped at
+# their native stack depth. Code that imported a function by name before
+# enable_metrics() keeps the unwrapped one; call through the module
+# (codex9.introsort_modules) to have it measured.
+_metrics_functions = {}  # name -> original function of every @instrumented task
+_metrics_enabled = False
+_metrics_trace_memory = False
+_metrics_owns_tracing = False  # True if enable_metrics() started tracemalloc
+_metrics_registry = {}
+_metrics_lock = threading.Lock()
+_METRICS_SAMPLE_LIMIT = 4096
+
+
+class _MetricsThreadState(threading.local):
+    """Per-thread call bookkeeping, so RestorationPool workers cannot pop each other's frames."""
+    def __init__(self):
+        self.active = set()     # names of the measured calls running in this thread
+        self.peak_frames = []   # highest peak seen inside each active traced call
+
+
+_metrics_thread = _MetricsThreadState()
+
+
+def enable_metrics(trace_memory: bool = False):
+    """
+    Starts recording metrics for every instrumented task function.
+
+    Only the outermost call of a function is recorded, so a recursive task
+    implementation counts once per top-level call (each recursive step
+    does pass through the wrapper, which doubles its stack depth).
+
+    Arguments:
+        trace_memory (bool): Also record tracemalloc peak bytes per call
+            (starts tracemalloc if needed; slows calls down noticeably).
+    """
+    global _metrics_enabled, _metrics_trace_memory, _metrics_owns_tracing
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _metrics_owns_tracing = True
+    _metrics_trace_memory = trace_memory
+    if not _metrics_enabled:
+        module = globals()
+        for name, function in _metrics_functions.items():
+            module[name] = _metered(name, function)
+        _metrics_enabled = True
+
+
+def disable_metrics():
+    """Stops recording metrics (and tracemalloc, if enable_metrics started it); collected metrics are kept."""
+    global _metrics_enabled, _metrics_trace_memory, _metrics_owns_tracing
+    globals().update(_metrics_functions)
+    _metrics_enabled = False
+    _metrics_trace_memory = False
+    if _metrics_owns_tracing:
+        tracemalloc.stop()
+        _metrics_owns_tracing = False
+
+
+def reset_metrics():
+    """Drops every collected metric."""
+    with _metrics_lock:
+        _metrics_registry.clear()
+
+
+@contextlib.contextmanager
+def collect_metrics(trace_memory: bool = False):
+    """Context manager that enables metrics for the duration of a with-block."""
+    enable_metrics(trace_memory)
+    try:
+        yield
+    finally:
+        disable_metrics()
+
+
+def _record_call(name: str, seconds: float, size, peak_bytes):
+    with _metrics_lock:
+        stats = _metrics_registry.get(name)
+        if stats is None:
+            stats = _metrics_registry[name] = {"calls": 0, "total_seconds": 0.0, "samples": [],
+                                               "input_items": 0, "max_input": None, "peak_bytes": None}
+        stats["calls"] += 1
+        stats["total_seconds"] += seconds
+        samples = stats["samples"]
+        if len(samples) < _METRICS_SAMPLE_LIMIT:
+            samples.append(seconds)
+        else:
+            # Reservoir sampling keeps a uniform sample of all calls.
+            slot = random.randrange(stats["calls"])
+            if slot < _METRICS_SAMPLE_LIMIT:
+                samples[slot] = seconds
+        if size is not None:
+            stats["input_items"] += size
+            stats["max_input"] = size if stats["max_input"] is None else max(stats["max_input"], size)
+        if peak_bytes is not None:
+            stats["peak_bytes"] = peak_bytes if stats["peak_bytes"] is None else max(stats["peak_bytes"], peak_bytes)
+
+
+def _measured_call(name: str, function, args, kwargs):
+    size = None
+    if args:
+        try:
+            size = len(args[0])
+        except TypeError:
+            pass
+
+    # tracemalloc's peak is process-wide: concurrent threads' allocations count too.
+    frames = _metrics_thread.peak_frames
+    trace = _metrics_trace_memory and tracemalloc.is_tracing()
+    if trace:
+        current, peak = tracemalloc.get_traced_memory()
+        if frames:
+            frames[-1] = max(frames[-1], peak)
+        tracemalloc.reset_peak()
+        frames.append(0)
+    started = time.perf_counter()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        seconds = time.perf_counter() - started
+        peak_bytes = None
+        if trace:
+            peak = max(tracemalloc.get_traced_memory()[1], frames.pop())
+            if frames:
+                frames[-1] = max(frames[-1], peak)
+            peak_bytes = max(peak - current, 0)
+        _record_call(name, seconds, size, peak_bytes)
+
+
+def _metered(name: str, function):
+    """Wraps function so that its outermost call in each thread is measured."""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        active = _metrics_thread.active
+        if name in active:
+            return function(*args, **kwargs)
+        active.add(name)
+        try:
+            return _measured_call(name, function, args, kwargs)
+        finally:
+            active.discard(name)
+    return wrapper
+
+
+def instrumented(function):
+    """Registers a module-level task function for metrics; it is only wrapped while metrics are enabled."""
+    _metrics_functions[function.__name__] = function
+    return function
+
+
+def _percentile(ordered: list, p: float) -> float:
+    return ordered[max(math.ceil(p / 100 * len(ordered)), 1) - 1]
+
+
+def metrics_snapshot() -> dict:
+    """
+    Returns the collected metrics per function.
+
+    Returns:
+        dict: name -> {'calls', 'total_seconds', 'mean_seconds', 'p50_seconds', 'p95_seconds',
+              'p99_seconds', 'max_seconds', 'input_items', 'max_input', 'peak_bytes'}.
+              Percentiles come from a uniform sample of at most 4096 calls.
+    """
+    snapshot = {}
+    with _metrics_lock:
+        for name, stats in _metrics_registry.items():
+            ordered = sorted(stats["samples"])
+            snapshot[name] = {
+                "calls": stats["calls"],
+                "total_seconds": stats["total_seconds"],
+                "mean_seconds": stats["total_seconds"] / stats["calls"],
+                "p50_seconds": _percentile(ordered, 50),
+                "p95_seconds": _percentile(ordered, 95),
+                "p99_seconds": _percentile(ordered, 99),
+                "max_seconds": ordered[-1],
+                "input_items": stats["input_items"],
+                "max_input": stats["max_input"],
+                "peak_bytes": stats["peak_bytes"],
+            }
+    return snapshot
+
+
+def export_metrics(path: str = None) -> str:
+    """Serializes metrics_snapshot() as JSON, writing it to path when given; returns the JSON text."""
+    text = json.dumps(metrics_snapshot(), indent=2, sort_keys=True)
+    if path is not None:
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    return text
 
 
 # =======================================================
 # 🧩 TASK 1 — Decode the Fragment (Strings → Lists)
 # =======================================================
+@instrumented
 def decode_fragment(fragment: str) -> list:
     """
     Splits a corrupted string by ';', reverses each segment,
@@ -57,9 +273,145 @@ def decode_fragment(fragment: str) -> list:
     pass
 
 
+# -------------------------------------------------------
+# ⚙️ TASK 1 — Streaming Fragment Decoder (Files → Generator)
+# -------------------------------------------------------
+def _reverse_segment(segment: str) -> str:
+    return segment[::-1]
+
+
+# LRU-memoized _reverse_segment while the decode cache is enabled, else None.
+_decode_cache = None
+
+
+def _decode_segment(segment) -> str:
+    """Reverses a single segment, decoding it first if it is raw bytes."""
+    if isinstance(segment, (bytes, bytearray)):
+        segment = segment.decode("utf-8")
+    if _decode_cache is None:
+        return segment[::-1]
+    return _decode_cache(segment)
+
+
+def enable_decode_cache(maxsize: int = 4096):
+    """
+    Turns on segment-level memoization for the fragment decoders.
+
+    Recurring segments are then served from an LRU cache instead of being
+    reversed again. This pays off when the same (long) segments repeat
+    across many fragments; for short, mostly unique segments the cache
+    lookup costs about as much as the reversal it saves. Re-enabling with a
+    new maxsize starts from an empty cache.
+
+    Arguments:
+        maxsize (int): Maximum number of cached segments (None for unbounded).
+    """
+    global _decode_cache
+    _decode_cache = functools.lru_cache(maxsize=maxsize)(_reverse_segment)
+
+
+def disable_decode_cache():
+    """Turns segment memoization off and drops the cached segments."""
+    global _decode_cache
+    _decode_cache = None
+
+
+def clear_decode_cache():
+    """Empties the decode cache (and resets its statistics) without disabling it."""
+    if _decode_cache is not None:
+        _decode_cache.cache_clear()
+
+
+def decode_cache_info():
+    """Returns the cache's (hits, misses, maxsize, currsize) statistics, or None when disabled."""
+    return _decode_cache.cache_info() if _decode_cache is not None else None
+
+
+@instrumented
+def decode_fragment_cached(fragment: str) -> list:
+    """
+    Same result as decode_fragment(), reversing segments through the decode
+    cache when it is enabled.
+
+    Arguments:
+        fragment (str): A semicolon-separated string of corrupted words.
+
+    Returns:
+        list: A list of decoded words.
+
+    Example Input:
+        "edoc;nohtyp;ataD"
+    Example Output:
+        ['code', 'python', 'Data']
+    """
+    return [_decode_segment(segment) for segment in fragment.split(";")]
+
+
+def decode_fragment_stream(source, chunk_size: int = 1 << 16):
+    """
+    Lazily decodes a semicolon-separated fragment read from a file object
+    or a memory-mapped file, yielding one decoded word at a time.
+
+    Only the current chunk and the segment being assembled are held in
+    memory, so peak usage is bounded by the longest segment instead of by
+    the size of the dump. Segments that cross a chunk boundary are stitched
+    together before they are decoded. The output matches decode_fragment()
+    on the same content, including the empty words produced by leading,
+    trailing or doubled ';'. Segments go through the decode cache when it is
+    enabled (see enable_decode_cache).
+
+    Arguments:
+        source: A text or binary file object, or an mmap.mmap, providing read(size).
+            Binary content is decoded as UTF-8 one segment at a time.
+        chunk_size (int): Number of characters (or bytes) requested per read.
+
+    Yields:
+        str: The decoded words in fragment order.
+
+    Example Input:
+        io.StringIO("edoc;nohtyp;ataD"), chunk_size=4
+    Example Output:
+        'code', 'python', 'Data'
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    empty, sep = "", ";"
+    pending = []  # pieces of a segment that spans several chunks
+    first = True
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        if first:
+            if isinstance(chunk, (bytes, bytearray)):
+                empty, sep = b"", b";"
+            first = False
+
+        parts = chunk.split(sep)
+        if len(parts) == 1:
+            # No separator in this chunk: keep accumulating the current segment.
+            pending.append(chunk)
+            continue
+        if pending:
+            pending.append(parts[0])
+            parts[0] = empty.join(pending)
+            pending = []
+
+        tail = parts.pop()
+        for segment in parts:
+            yield _decode_segment(segment)
+        if tail:
+            pending.append(tail)
+
+    # Whatever follows the last ';' is a segment too (str.split semantics).
+    yield _decode_segment(empty.join(pending))
+
+
 # =======================================================
 # 🧩 TASK 2 — Organize the Blueprint Segments (Lists → Tuples)
 # =======================================================
+@instrumented
 def organize_segments(words: list, module_numbers: list) -> list:
     """
     Combines two lists into a list of tuples (word, id).
@@ -84,6 +436,7 @@ def organize_segments(words: list, module_numbers: list) -> list:
 # =======================================================
 # 🧩 TASK 3 — Verify Module Uniqueness (Sets)
 # =======================================================
+@instrumented
 def unique_modules(modules: list) -> list:
     """
     Removes duplicate module tuples and returns a list of unique ones.
@@ -103,9 +456,96 @@ def unique_modules(modules: list) -> list:
     pass
 
 
+# -------------------------------------------------------
+# ⚙️ TASK 3 — Order-Preserving Streaming Dedup (Iterables → Generator)
+# -------------------------------------------------------
+def _read_records(handle):
+    """Yields the pickled records stored back to back in a spill file."""
+    while True:
+        try:
+            yield pickle.load(handle)
+        except EOFError:
+            return
+
+
+def _unique_modules_spilled(modules, partitions: int, spill_dir):
+    """Hash-partitioned dedup that keeps only one partition's keys in memory."""
+    with tempfile.TemporaryDirectory(prefix="codex9-dedup-", dir=spill_dir) as workdir:
+        paths = [os.path.join(workdir, "part-%d" % i) for i in range(partitions)]
+
+        # Pass 1: route every (position, module) record to its hash partition.
+        # Equal tuples always share a partition, so each one can be deduped alone.
+        buckets = [open(path, "wb") for path in paths]
+        try:
+            for position, module in enumerate(modules):
+                pickle.dump((position, module), buckets[hash(module) % partitions],
+                            pickle.HIGHEST_PROTOCOL)
+        finally:
+            for bucket in buckets:
+                bucket.close()
+
+        # Pass 2: dedup each partition; survivors stay sorted by position.
+        for path in paths:
+            with open(path, "rb") as src, open(path + ".uniq", "wb") as dst:
+                seen = set()
+                for position, module in _read_records(src):
+                    if module not in seen:
+                        seen.add(module)
+                        pickle.dump((position, module), dst, pickle.HIGHEST_PROTOCOL)
+            os.remove(path)
+
+        # Pass 3: k-way merge the survivors back into input order.
+        readers = [open(path + ".uniq", "rb") for path in paths]
+        try:
+            merged = heapq.merge(*(_read_records(reader) for reader in readers),
+                                 key=lambda record: record[0])
+            for _, module in merged:
+                yield module
+        finally:
+            for reader in readers:
+                reader.close()
+
+
+def unique_modules_stream(modules, partitions: int = 0, spill_dir: str = None):
+    """
+    Removes duplicate module tuples from any iterable, yielding the first
+    occurrence of each tuple in input order.
+
+    By default the seen-set is kept in memory. With partitions > 0 the input
+    is hash-partitioned into that many temporary files, each partition is
+    deduplicated on its own and the survivors are merged back by position,
+    so only one partition's distinct tuples are held in RAM at a time.
+
+    Arguments:
+        modules (iterable): (word, id) tuples which may contain duplicates.
+        partitions (int): Number of on-disk hash partitions; 0 disables spilling.
+        spill_dir (str): Directory for the temporary partition files (system default if None).
+
+    Yields:
+        tuple: Unique module tuples in the order they first appeared.
+
+    Example Input:
+        [('python', 215), ('code', 104), ('python', 215)]
+    Example Output:
+        ('python', 215), ('code', 104)
+    """
+    if partitions < 0:
+        raise ValueError("partitions must be zero or a positive integer")
+    if partitions:
+        yield from _unique_modules_spilled(modules, partitions, spill_dir)
+        return
+
+    seen = set()
+    for module in modules:
+        if module not in seen:
+            seen.add(module)
+            yield module
+
+
 # =======================================================
 # 🧩 TASK 4 — Build the Restoration Queue (Queue)
 # =======================================================
+@instrumented
 def build_restoration_queue(unique_list: list) -> list:
     """
     Simulates restoring modules using a FIFO queue.
@@ -125,9 +565,169 @@ def build_restoration_queue(unique_list: list) -> list:
     # TODO: Use deque for queue logic
     pass
 
+
+# -------------------------------------------------------
+# ⚙️ TASK 4 — Concurrent Restoration Pool (Queue → Worker Pool)
+# -------------------------------------------------------
+def _noop_restore(module):
+    """Default restore callback: nothing to do beyond dequeuing the module."""
+    return None
+
+
+class RestorationPool:
+    """Restores modules on a pool of workers while keeping FIFO result order.
+
+    Modules are fed to the workers through a bounded window of at most
+    max_pending in-flight restorations, so a slow restore callback applies
+    backpressure to the producer instead of buffering the whole input.
+    Results are collected oldest-first, so the returned IDs are always in
+    input order no matter which worker finishes first. Instead of printing
+    one message per module, progress is recorded in structured counters.
+
+    Attributes:
+        restore (callable): Called as restore((word, id)) for every module; may be a coroutine function in run_async().
+        workers (int): Number of worker threads / asyncio tasks.
+        max_pending (int): Maximum number of modules queued or in flight at once.
+        counters (dict): 'queued', 'restored', 'failed' and 'elapsed' (seconds) of the last run.
+        failures (list): (module_id, exception) pairs for restorations that raised in the last run.
+    """
+    def __init__(self, restore=None, workers: int = 4, max_pending: int = None):
+        if workers < 1:
+            raise ValueError("workers must be a positive integer")
+        if max_pending is None:
+            max_pending = 4 * workers
+        if max_pending < 1:
+            raise ValueError("max_pending must be a positive integer")
+        self.restore = restore or _noop_restore
+        self.workers = workers
+        self.max_pending = max_pending
+        self.reset_counters()
+
+    def reset_counters(self):
+        """Clears the counters and recorded failures; run() and run_async() call it first."""
+        self.counters = {"queued": 0, "restored": 0, "failed": 0, "elapsed": 0.0}
+        self.failures = []
+
+    def _record(self, module_id, error, order: list):
+        if error is None:
+            self.counters["restored"] += 1
+            order.append(module_id)
+        else:
+            self.counters["failed"] += 1
+            self.failures.append((module_id, error))
+
+    def run(self, unique_list) -> list:
+        """
+        Restores every module on a thread pool.
+
+        Arguments:
+            unique_list (iterable): Unique module tuples (word, id).
+
+        Returns:
+            list: IDs of the successfully restored modules, in input order.
+        """
+        self.reset_counters()
+        started = time.perf_counter()
+        order = []
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for module in unique_list:
+                if len(in_flight) >= self.max_pending:
+                    module_id, future = in_flight.popleft()
+                    self._record(module_id, future.exception(), order)
+                in_flight.append((module[1], pool.submit(self.restore, module)))
+                self.counters["queued"] += 1
+            while in_flight:
+                module_id, future = in_flight.popleft()
+                self._record(module_id, future.exception(), order)
+        self.counters["elapsed"] = time.perf_counter() - started
+        return order
+
+    async def run_async(self, unique_list) -> list:
+        """
+        Restores every module on asyncio worker tasks fed by a bounded queue.
+
+        Coroutine restore callbacks are awaited directly; plain callables are
+        run in the default executor so they do not block the event loop.
+
+        Arguments:
+            unique_list (iterable): Unique module tuples (word, id).
+
+        Returns:
+            list: IDs of the successfully restored modules, in input order.
+        """
+        self.reset_counters()
+        started = time.perf_counter()
+        queue = asyncio.Queue(maxsize=self.max_pending)
+        ids, errors = [], {}
+        is_coroutine = asyncio.iscoroutinefunction(self.restore)
+
+        async def worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    queue.task_done()
+                    return
+                position, module = item
+                try:
+                    if is_coroutine:
+                        await self.restore(module)
+                    else:
+                        await asyncio.to_thread(self.restore, module)
+                except Exception as error:  # recorded, not fatal for the batch
+                    errors[position] = error
+                queue.task_done()
+
+        tasks = [asyncio.create_task(worker()) for _ in range(self.workers)]
+        try:
+            for position, module in enumerate(unique_list):
+                await queue.put((position, module))
+                ids.append(module[1])
+                self.counters["queued"] += 1
+            for _ in tasks:
+                await queue.put(None)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        order = []
+        for position, module_id in enumerate(ids):
+            self._record(module_id, errors.get(position), order)
+        self.counters["elapsed"] = time.perf_counter() - started
+        return order
+
+
+@instrumented
+def restore_modules_concurrent(unique_list, restore=None, workers: int = 4,
+                               max_pending: int = None, use_asyncio: bool = False) -> list:
+    """
+    Concurrent counterpart of build_restoration_queue().
+
+    Arguments:
+        unique_list (iterable): Unique module tuples (word, id).
+        restore (callable): Per-module restore callback (no-op if None).
+        workers (int): Number of concurrent workers.
+        max_pending (int): Bound on queued/in-flight modules (4 * workers if None).
+        use_asyncio (bool): Run on asyncio tasks instead of a thread pool.
+
+    Returns:
+        list: Restored module IDs in input order.
+
+    Example Input:
+        [('code', 104), ('python', 215), ('Data', 309)]
+    Example Output:
+        [104, 215, 309]
+    """
+    pool = RestorationPool(restore, workers, max_pending)
+    if use_asyncio:
+        return asyncio.run(pool.run_async(unique_list))
+    return pool.run(unique_list)
+
 # =======================================================
 # 🧩 TASK 5 — Track Actions with Stack (Stack)
 # =======================================================
+@instrumented
 def track_actions(module_ids: list) -> list:
     """
     Simulates restoring modules and tracks operations in a stack.
@@ -150,9 +750,119 @@ def track_actions(module_ids: list) -> list:
     pass
 
 
+# -------------------------------------------------------
+# ⚙️ TASK 5 — Packed Action Log with Undo/Redo (Stack → Array)
+# -------------------------------------------------------
+class ActionLog:
+    """An integer-encoded action stack with O(1) multi-undo and redo.
+
+    Every action is packed into one signed 64-bit slot of an array('q') as
+    module_id * 2 + opcode (0 = load, 1 = verify), instead of one string
+    object per action. Undo and redo only move a cursor over that buffer, so
+    undoing k actions is O(1); pushing after an undo overwrites the redo
+    tail in place. The legacy 'load_<id>' / 'verify_<id>' strings are only
+    built when the log is iterated or rendered.
+
+    Attributes:
+        LOAD (int): Opcode of a 'load' action.
+        VERIFY (int): Opcode of a 'verify' action.
+    """
+    __slots__ = ("_codes", "_cursor", "_end", "_checkpoints")
+
+    LOAD, VERIFY = 0, 1
+    _NAMES = ("load", "verify")
+
+    def __init__(self):
+        self._codes = array("q")
+        self._cursor = 0       # number of active (not undone) actions
+        self._end = 0          # active actions plus the redoable ones
+        self._checkpoints = {}
+
+    @classmethod
+    def from_module_ids(cls, module_ids) -> "ActionLog":
+        """
+        Builds the Task 5 log: alternating load/verify actions, one per module.
+
+        Arguments:
+            module_ids (iterable): Module IDs in restoration order.
+
+        Returns:
+            ActionLog: A log whose render() equals the action list before any undo.
+        """
+        log = cls()
+        log._codes.extend(module_id * 2 + (position & 1) for position, module_id in enumerate(module_ids))
+        log._cursor = log._end = len(log._codes)
+        return log
+
+    def push(self, opcode: int, module_id: int):
+        """
+        Records one action, discarding anything that could still be redone.
+
+        Arguments:
+            opcode (int): ActionLog.LOAD or ActionLog.VERIFY.
+            module_id (int): The module the action applies to.
+        """
+        if opcode not in (self.LOAD, self.VERIFY):
+            raise ValueError("unknown opcode: %r" % (opcode,))
+        code = module_id * 2 + opcode
+        cursor = self._cursor
+        if cursor < len(self._codes):
+            self._codes[cursor] = code
+        else:
+            self._codes.append(code)
+        if self._end > cursor:
+            # The redo tail is gone; so are checkpoints that pointed into it.
+            self._checkpoints = {name: mark for name, mark in self._checkpoints.items() if mark <= cursor}
+        self._cursor = self._end = cursor + 1
+
+    def undo(self, k: int = 1) -> int:
+        """Undoes the last k actions (fewer if the log is shorter); returns how many were undone."""
+        k = min(max(k, 0), self._cursor)
+        self._cursor -= k
+        return k
+
+    def redo(self, k: int = 1) -> int:
+        """Re-applies up to k undone actions; returns how many were redone."""
+        k = min(max(k, 0), self._end - self._cursor)
+        self._cursor += k
+        return k
+
+    def checkpoint(self, name):
+        """Remembers the current position under name."""
+        self._checkpoints[name] = self._cursor
+
+    def rollback(self, name):
+        """Moves the cursor back (or forward) to a checkpoint in O(1); KeyError if it is unknown or stale."""
+        self._cursor = self._checkpoints[name]
+
+    def __len__(self) -> int:
+        return self._cursor
+
+    def _render(self, code: int) -> str:
+        return "%s_%d" % (self._NAMES[code & 1], code >> 1)
+
+    def __getitem__(self, position: int) -> str:
+        if position < 0:
+            position += self._cursor
+        if not 0 <= position < self._cursor:
+            raise IndexError("action index out of range")
+        return self._render(self._codes[position])
+
+    def __iter__(self):
+        """Lazily yields the active actions in their legacy string form."""
+        codes, render = self._codes, self._render
+        for position in range(self._cursor):
+            yield render(codes[position])
+
+    def render(self) -> list:
+        """Returns the active actions as the list of strings track_actions() returns."""
+        return list(self)
+
+
 # =======================================================
 # 🧩 TASK 6 — Map Actions to Metadata (Dictionaries)
 # =======================================================
+@instrumented
 def map_actions_to_metadata(actions: list, metadata: dict) -> dict:
     """
     Maps action names to their metadata using module IDs.
@@ -180,9 +890,110 @@ def map_actions_to_metadata(actions: list, metadata: dict) -> dict:
     pass
 
 
+# -------------------------------------------------------
+# ⚙️ TASK 6 — Cached Action Index and Lazy Metadata Views (Dictionaries)
+# -------------------------------------------------------
+def _parse_action(action: str) -> int:
+    """Extracts the module ID from an 'action_moduleID' name."""
+    return int(action.rpartition("_")[2])
+
+
+class ActionMetadataView(Mapping):
+    """A read-only action -> metadata mapping resolved lazily from the source dict.
+
+    Nothing is copied from the metadata dict: every lookup goes through the
+    pre-parsed module ID of the action, so later changes to the metadata are
+    visible through the view. Actions whose module has no metadata are not
+    part of the mapping.
+    """
+    __slots__ = ("_module_ids", "_metadata")
+
+    def __init__(self, module_ids: dict, metadata: dict):
+        self._module_ids = module_ids
+        self._metadata = metadata
+
+    def __getitem__(self, action: str):
+        return self._metadata[self._module_ids[action]]
+
+    def __contains__(self, action) -> bool:
+        module_id = self._module_ids.get(action)
+        return module_id is not None and module_id in self._metadata
+
+    def __iter__(self):
+        metadata = self._metadata
+        for action, module_id in self._module_ids.items():
+            if module_id in metadata:
+                yield action
+
+    def __len__(self) -> int:
+        metadata = self._metadata
+        return sum(1 for module_id in self._module_ids.values() if module_id in metadata)
+
+
+class ActionMetadataIndex:
+    """Parses action names once and serves lazy metadata views for them.
+
+    Parsed module IDs are kept in a bounded LRU cache shared by every view
+    built from this index, so mapping the same action lists again against
+    the same (or an updated) metadata table skips the string splitting.
+
+    Attributes:
+        maxsize (int): Maximum number of cached action names.
+    """
+    def __init__(self, maxsize: int = 1 << 16):
+        self.maxsize = maxsize
+        self._parse = functools.lru_cache(maxsize=maxsize)(_parse_action)
+
+    def module_id(self, action: str) -> int:
+        """Returns the module ID of an action name (cached)."""
+        return self._parse(action)
+
+    def view(self, actions, metadata: dict) -> ActionMetadataView:
+        """
+        Maps action names to their metadata without copying it.
+
+        Arguments:
+            actions (iterable): Action names in the format 'action_moduleID'.
+            metadata (dict): A dictionary mapping module IDs to their metadata.
+
+        Returns:
+            ActionMetadataView: A read-only Mapping from action name to metadata.
+
+        Example Input:
+            actions = ['load_104', 'verify_215']
+            metadata = {104: {"size": 3.4, "status": "ok"}, 215: {"size": 5.2, "status": "ok"}}
+        Example Output:
+            {'load_104': {'size': 3.4, 'status': 'ok'}, 'verify_215': {'size': 5.2, 'status': 'ok'}}
+        """
+        parse = self._parse
+        return ActionMetadataView({action: parse(action) for action in actions}, metadata)
+
+    def map_batches(self, batches, metadata: dict) -> list:
+        """
+        Maps many action batches against one metadata table in a single pass.
+
+        Arguments:
+            batches (iterable): Iterables of action names.
+            metadata (dict): A dictionary mapping module IDs to their metadata.
+
+        Returns:
+            list: One ActionMetadataView per batch, in input order.
+        """
+        return [self.view(batch, metadata) for batch in batches]
+
+    def cache_info(self):
+        """Returns the hit/miss statistics of the action-name cache."""
+        return self._parse.cache_info()
+
+    def cache_clear(self):
+        """Empties the action-name cache."""
+        self._parse.cache_clear()
+
+
 # =======================================================
 # 🧩 TASK 7 — Sort Modules by Size (Sorting Algorithm)
 # =======================================================
+@instrumented
 def quick_sort_modules(modules: list) -> list:
     """
     Implements quick sort to order (id, size) pairs by size ascending.
@@ -202,6 +1013,162 @@ def quick_sort_modules(modules: list) -> list:
     pass
 
 
+# -------------------------------------------------------
+# ⚙️ TASK 7 — Introsort Engine and Partial Sort (Sorting Algorithm)
+# -------------------------------------------------------
+_INSERTION_SORT_THRESHOLD = 16
+
+
+def _module_size(module):
+    """Default sort key: the size of an (id, size) pair."""
+    return module[1]
+
+
+def _insertion_sort(keys: list, items: list, lo: int, hi: int):
+    """Sorts keys[lo:hi] (and items alongside) by straight insertion."""
+    for i in range(lo + 1, hi):
+        key, item = keys[i], items[i]
+        j = i - 1
+        while j >= lo and keys[j] > key:
+            keys[j + 1] = keys[j]
+            items[j + 1] = items[j]
+            j -= 1
+        keys[j + 1] = key
+        items[j + 1] = item
+
+
+def _heapsort(keys: list, items: list, lo: int, hi: int):
+    """Sorts keys[lo:hi] (and items alongside) with an in-place max-heap."""
+    def sift_down(root: int, end: int):
+        while True:
+            child = 2 * root + 1
+            if child >= end:
+                return
+            if child + 1 < end and keys[lo + child] < keys[lo + child + 1]:
+                child += 1
+            a, b = lo + root, lo + child
+            if not keys[a] < keys[b]:
+                return
+            keys[a], keys[b] = keys[b], keys[a]
+            items[a], items[b] = items[b], items[a]
+            root = child
+
+    n = hi - lo
+    for start in range(n // 2 - 1, -1, -1):
+        sift_down(start, n)
+    for end in range(n - 1, 0, -1):
+        keys[lo], keys[lo + end] = keys[lo + end], keys[lo]
+        items[lo], items[lo + end] = items[lo + end], items[lo]
+        sift_down(0, end)
+
+
+def _median_of_three(a, b, c):
+    """Returns the median of three keys."""
+    if a < b:
+        if b < c:
+            return b
+        return c if a < c else a
+    if a < c:
+        return a
+    return c if b < c else b
+
+
+@instrumented
+def introsort_modules(modules, key=None) -> list:
+    """
+    Sorts (id, size) pairs by size with an iterative introsort.
+
+    Partitioning uses a median-of-three pivot and a three-way (<, ==, >)
+    split, so runs of equal sizes are finished in a single pass and sorted
+    input does not degrade to O(n²). Slices are kept on an explicit stack
+    (smaller side first, so the stack stays O(log n)); small slices are left
+    for one final insertion-sort pass, and any slice that exceeds the depth
+    budget of 2·log2(n) is finished with heapsort. The sort is not stable.
+
+    Arguments:
+        modules (iterable): (id, size) tuples.
+        key (callable): Sort key; defaults to the size field.
+
+    Returns:
+        list: A new list sorted by ascending key.
+
+    Example Input:
+        [(104, 3.4), (215, 5.2), (309, 2.1)]
+    Example Output:
+        [(309, 2.1), (104, 3.4), (215, 5.2)]
+    """
+    items = list(modules)
+    keys = list(map(key or _module_size, items))
+    n = len(items)
+    if n < 2:
+        return items
+
+    stack = [(0, n, 2 * n.bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo > _INSERTION_SORT_THRESHOLD:
+            if depth == 0:
+                _heapsort(keys, items, lo, hi)
+                break
+            depth -= 1
+            pivot = _median_of_three(keys[lo], keys[(lo + hi) // 2], keys[hi - 1])
+
+            # Dijkstra three-way partition:
+            # [lo, lt) < pivot, [lt, gt] == pivot, (gt, hi) > pivot.
+            lt, i, gt = lo, lo, hi - 1
+            while i <= gt:
+                k = keys[i]
+                if k < pivot:
+                    keys[lt], keys[i] = k, keys[lt]
+                    items[lt], items[i] = items[i], items[lt]
+                    lt += 1
+                    i += 1
+                elif pivot < k:
+                    keys[gt], keys[i] = k, keys[gt]
+                    items[gt], items[i] = items[i], items[gt]
+                    gt -= 1
+                else:
+                    i += 1
+
+            # Defer the larger side, keep partitioning the smaller one.
+            if lt - lo < hi - gt - 1:
+                stack.append((gt + 1, hi, depth))
+                hi = lt
+            else:
+                stack.append((lo, lt, depth))
+                lo = gt + 1
+
+    # Every element is now within _INSERTION_SORT_THRESHOLD of its final slot.
+    _insertion_sort(keys, items, 0, n)
+    return items
+
+
+@instrumented
+def top_k_modules(modules, k: int, key=None) -> list:
+    """
+    Returns only the k smallest modules by size, in ascending order.
+
+    Keeps a bounded heap of k candidates, so it runs in O(n log k) time and
+    O(k) memory and accepts any iterable. Ties keep their input order.
+
+    Arguments:
+        modules (iterable): (id, size) tuples.
+        k (int): Number of modules to return.
+        key (callable): Sort key; defaults to the size field.
+
+    Returns:
+        list: The k smallest (id, size) tuples sorted by size.
+
+    Example Input:
+        [(104, 3.4), (215, 5.2), (309, 2.1)], k=2
+    Example Output:
+        [(309, 2.1), (104, 3.4)]
+    """
+    if k < 0:
+        raise ValueError("k must not be negative")
+    return heapq.nsmallest(k, modules, key=key or _module_size)
+
+
 # =======================================================
 # 🧩 TASK 8 — Build the Integrity Tree (Binary Search Tree)
 # =======================================================
@@ -221,6 +1188,7 @@ class BSTNode:
         self.left = None
         self.right = None
 
+@instrumented
 def insert_bst(root: BSTNode, key: int, value: float) -> BSTNode:
     """
     Inserts (id, size) into BST ordered by size.
@@ -233,6 +1201,7 @@ def insert_bst(root: BSTNode, key: int, value: float) -> BSTNode:
     # TODO: Insert node correctly
     pass
 
+@instrumented
 def inorder_bst(root: BSTNode) -> list:
     """
     Returns inorder traversal of BST as list of (id, size) pairs.
@@ -244,10 +1213,261 @@ def inorder_bst(root: BSTNode) -> list:
     pass
 
 
+# -------------------------------------------------------
+# ⚙️ TASK 8 — Lazy Iterative Inorder Traversal (BST → Generator)
+# -------------------------------------------------------
+def iter_inorder_bst(root: BSTNode, reverse: bool = False, start: float = None):
+    """
+    Lazily yields the (id, size) pairs of a BST in size order.
+
+    Uses an explicit stack instead of recursion, so deep or degenerate trees
+    cannot raise RecursionError and memory stays O(height). Nothing is
+    copied up front: stopping after the first few items only visits the
+    path to them. With a start bound the traversal seeks straight to it,
+    which makes it cheap to page through the tree.
+
+    Arguments:
+        root (BSTNode): The root of the BST (AVLNode trees work as well).
+        reverse (bool): Yield the largest sizes first.
+        start (float): Skip sizes below start (above start when reverse=True).
+
+    Yields:
+        tuple: (id, size) pairs.
+
+    Example Input:
+        BST built from [(309, 2.1), (104, 3.4), (215, 5.2)], start=3.0
+    Example Output:
+        (104, 3.4), (215, 5.2)
+    """
+    stack = []
+    node = root
+    if not reverse:
+        while stack or node is not None:
+            if node is not None:
+                if start is not None and node.value < start:
+                    node = node.right  # node and its left subtree are below start
+                else:
+                    stack.append(node)
+                    node = node.left
+                continue
+            node = stack.pop()
+            yield (node.key, node.value)
+            node = node.right
+    else:
+        while stack or node is not None:
+            if node is not None:
+                if start is not None and node.value > start:
+                    node = node.left  # node and its right subtree are above start
+                else:
+                    stack.append(node)
+                    node = node.right
+                continue
+            node = stack.pop()
+            yield (node.key, node.value)
+            node = node.left
+
+
+# -------------------------------------------------------
+# ⚙️ TASK 8 — Self-Balancing Integrity Tree (AVL Tree)
+# -------------------------------------------------------
+class AVLNode:
+    """A compact node of the self-balancing integrity tree.
+
+    Has the same key/value/left/right fields as BSTNode, so the BSTNode
+    helpers can walk it, plus the height of its subtree.
+
+    Attributes:
+        key (int): The module ID.
+        value (float): The module size.
+        left (AVLNode): Left child node.
+        right (AVLNode): Right child node.
+        height (int): Height of the subtree rooted at this node.
+    """
+    __slots__ = ("key", "value", "left", "right", "height")
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.height = 1
+
+
+def _avl_height(node: AVLNode) -> int:
+    return node.height if node is not None else 0
+
+
+def _avl_update(node: AVLNode):
+    node.height = 1 + max(_avl_height(node.left), _avl_height(node.right))
+
+
+def _avl_rotate_right(node: AVLNode) -> AVLNode:
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _avl_update(node)
+    _avl_update(pivot)
+    return pivot
+
+
+def _avl_rotate_left(node: AVLNode) -> AVLNode:
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _avl_update(node)
+    _avl_update(pivot)
+    return pivot
+
+
+def _avl_rebalance(node: AVLNode) -> AVLNode:
+    """Refreshes node's height and rotates if it is out of balance; returns the new subtree root."""
+    _avl_update(node)
+    balance = _avl_height(node.left) - _avl_height(node.right)
+    if balance > 1:
+        if _avl_height(node.left.left) < _avl_height(node.left.right):
+            node.left = _avl_rotate_left(node.left)
+        return _avl_rotate_right(node)
+    if balance < -1:
+        if _avl_height(node.right.right) < _avl_height(node.right.left):
+            node.right = _avl_rotate_right(node.right)
+        return _avl_rotate_left(node)
+    return node
+
+
+class IntegrityTree:
+    """A self-balancing (AVL) integrity tree of (id, size) pairs ordered by size.
+
+    Insertion is iterative and the height stays within 1.44·log2(n), so
+    modules that arrive in size order no longer degrade the tree into a
+    linked list. Equal sizes keep their insertion order, matching insert_bst.
+
+    Attributes:
+        root (AVLNode): The root node, or None for an empty tree.
+    """
+    __slots__ = ("root", "_size")
+
+    def __init__(self, pairs=None):
+        self.root = None
+        self._size = 0
+        if pairs is not None:
+            for key, value in pairs:
+                self.insert(key, value)
+
+    @classmethod
+    def from_sorted(cls, pairs) -> "IntegrityTree":
+        """
+        Builds a perfectly balanced tree in O(n) from pairs already sorted by size.
+
+        Arguments:
+            pairs (iterable): (id, size) tuples in ascending size order.
+
+        Returns:
+            IntegrityTree: The bulk-loaded tree.
+        """
+        pairs = pairs if isinstance(pairs, list) else list(pairs)
+        for i in range(1, len(pairs)):
+            if pairs[i][1] < pairs[i - 1][1]:
+                raise ValueError("pairs must be sorted by size")
+
+        def build(lo: int, hi: int) -> AVLNode:
+            # Recursion depth is log2(n): the halves are balanced by construction.
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            node = AVLNode(*pairs[mid])
+            node.left = build(lo, mid)
+            node.right = build(mid + 1, hi)
+            _avl_update(node)
+            return node
+
+        tree = cls()
+        tree.root = build(0, len(pairs))
+        tree._size = len(pairs)
+        return tree
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def height(self) -> int:
+        """Height of the tree (0 when empty)."""
+        return _avl_height(self.root)
+
+    def insert(self, key: int, value: float):
+        """
+        Inserts (id, size) without recursion, rebalancing on the way back up.
+
+        Arguments:
+            key (int): The module ID.
+            value (float): The module size.
+        """
+        node = AVLNode(key, value)
+        self._size += 1
+        if self.root is None:
+            self.root = node
+            return
+
+        path = []
+        current = self.root
+        while current is not None:
+            path.append(current)
+            current = current.left if value < current.value else current.right
+        parent = path[-1]
+        if value < parent.value:
+            parent.left = node
+        else:
+            parent.right = node
+
+        for i in range(len(path) - 1, -1, -1):
+            current = path[i]
+            old_height = current.height
+            subtree = _avl_rebalance(current)
+            if i == 0:
+                self.root = subtree
+            elif path[i - 1].left is current:
+                path[i - 1].left = subtree
+            else:
+                path[i - 1].right = subtree
+            if subtree.height == old_height:
+                break  # the ancestors' heights cannot change any more
+
+    def __iter__(self):
+        """Yields (id, size) pairs in ascending size order."""
+        return iter_inorder_bst(self.root)
+
+    def __reversed__(self):
+        """Yields (id, size) pairs in descending size order."""
+        return iter_inorder_bst(self.root, reverse=True)
+
+    def inorder(self) -> list:
+        """Returns the inorder traversal as a list, like inorder_bst."""
+        return list(self)
+
+    def range(self, low: float = None, high: float = None):
+        """
+        Yields the (id, size) pairs with low <= size <= high, smallest first.
+
+        The traversal seeks directly to low and stops at the first size above
+        high, so a query costs O(log n + m) for m results. None means unbounded.
+
+        Arguments:
+            low (float): Lower size bound (inclusive).
+            high (float): Upper size bound (inclusive).
+
+        Yields:
+            tuple: (id, size) pairs within the range.
+        """
+        for pair in iter_inorder_bst(self.root, start=low):
+            if high is not None and pair[1] > high:
+                return
+            yield pair
+
+
 
 # =======================================================
 # 🧩 TASK 9 — Connect the Modules (Graph)
 # =======================================================
+@instrumented
 def build_dependency_graph(connection_map: dict) -> dict:
     """
     Builds adjacency list representing module dependencies.
@@ -272,9 +1492,79 @@ def build_dependency_graph(connection_map: dict) -> dict:
     pass
 
 
+# -------------------------------------------------------
+# ⚙️ TASK 9 — Compact CSR Dependency Graph (Graph → Arrays)
+# -------------------------------------------------------
+class CompactGraph(Mapping):
+    """A read-only dependency graph stored in compressed-sparse-row form.
+
+    Module IDs are interned to dense integers 0..n-1 and the adjacency is
+    kept in two array('l') buffers: the dependents of node i are
+    targets[offsets[i]:offsets[i + 1]], in their original order. That costs
+    one machine word per edge instead of a list slot plus a string
+    reference. The graph still behaves like the adjacency dict returned by
+    build_dependency_graph (graph[module_id] gives the list of dependent
+    IDs), so DFS code written against a dict can consume it directly.
+    Modules that only appear as dependents are included with no edges.
+
+    Attributes:
+        ids (list): Module ID of each dense index.
+        index (dict): Module ID -> dense index.
+        offsets (array): n + 1 edge offsets into targets.
+        targets (array): Dense indices of the dependent modules.
+    """
+    __slots__ = ("ids", "index", "offsets", "targets")
+
+    def __init__(self, connection_map: dict = None):
+        self.ids = []
+        self.index = {}
+        self.offsets = array("l", [0])
+        self.targets = array("l")
+        if connection_map:
+            # Intern the keys first so their edges land in index order.
+            for module_id in connection_map:
+                self._intern(module_id)
+            for dependents in connection_map.values():
+                self.targets.extend(self._intern(module_id) for module_id in dependents)
+                self.offsets.append(len(self.targets))
+            # Modules seen only as dependents get empty adjacency slices.
+            self.offsets.extend([len(self.targets)] * (len(self.ids) + 1 - len(self.offsets)))
+
+    def _intern(self, module_id) -> int:
+        position = self.index.get(module_id)
+        if position is None:
+            position = self.index[module_id] = len(self.ids)
+            self.ids.append(module_id)
+        return position
+
+    def __getitem__(self, module_id) -> list:
+        position = self.index[module_id]
+        ids = self.ids
+        return [ids[t] for t in self.targets[self.offsets[position]:self.offsets[position + 1]]]
+
+    def __contains__(self, module_id) -> bool:
+        return module_id in self.index
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        """Total number of dependency edges."""
+        return len(self.targets)
+
+    def successors(self, position: int) -> array:
+        """Returns the dense indices of the dependents of dense index position."""
+        return self.targets[self.offsets[position]:self.offsets[position + 1]]
+
+
 # =======================================================
 # 🧩 TASK 10 — Reboot Codex-9 (Graph Traversal)
 # =======================================================
+@instrumented
 def dfs_activation(graph: dict, start: str) -> list:
     """
     Performs Depth-First Search (DFS) to determine activation order.
@@ -304,3 +1594,537 @@ def dfs_activation(graph: dict, start: str) -> list:
     pass
 
 
+# -------------------------------------------------------
+# ⚙️ TASK 10 — Iterative Activation Engine (Graph Traversal)
+# -------------------------------------------------------
+_REBOOT_MESSAGE = "Blueprint successfully restored. Codex-9 reboot complete."
+
+
+class DependencyCycleError(ValueError):
+    """Raised when a topological activation meets a dependency cycle.
+
+    Attributes:
+        path (list): The cycle as module IDs, starting and ending with the same module.
+    """
+    def __init__(self, path: list):
+        super().__init__("dependency cycle: " + " -> ".join(map(str, path)))
+        self.path = path
+
+
+def _traversal_view(graph, starts):
+    """
+    Returns (neighbors, roots, label) for walking graph from starts.
+
+    CompactGraph is walked on its dense integer indices; label maps an
+    index back to the module ID. Plain dicts are walked on the IDs
+    themselves. Either way, modules missing from the graph have no
+    dependents, so a missing start activates only itself.
+    """
+    if isinstance(graph, CompactGraph):
+        index, ids = graph.index, graph.ids
+        n = len(ids)
+        missing = {}  # start ID -> index past the graph's own nodes
+        roots = []
+        for start in starts:
+            position = index.get(start)
+            if position is None:
+                position = missing.setdefault(start, n + len(missing))
+            roots.append(position)
+        if not missing:
+            return graph.successors, roots, ids.__getitem__
+        extra = list(missing)
+
+        def neighbors(node: int):
+            return graph.successors(node) if node < n else ()
+
+        def label(node: int):
+            return ids[node] if node < n else extra[node - n]
+
+        return neighbors, roots, label
+    get = graph.get
+    return (lambda node: get(node, ())), list(starts), None
+
+
+def iter_dfs_activation(graph, starts):
+    """
+    Lazily yields the DFS activation order from one or many start modules.
+
+    Uses an explicit stack of neighbor iterators, so chains of any length are
+    safe, and produces exactly the preorder of the recursive DFS. With
+    several start modules the visited set is shared: every module is
+    activated once, the first time any start reaches it, in one O(V + E) pass.
+
+    Arguments:
+        graph (dict): An adjacency list (or CompactGraph) of module dependencies.
+        starts (iterable): The start module IDs, in activation priority order.
+
+    Yields:
+        str: Module IDs in the order they are activated.
+
+    Example Input:
+        {"104": ["215", "309"], "215": ["412"], "309": ["518"], "412": ["518"], "518": []},
+        starts=["104"]
+    Example Output:
+        '104', '215', '412', '518', '309'
+    """
+    neighbors, roots, label = _traversal_view(graph, starts)
+    visited = set()
+    for root in roots:
+        if root in visited:
+            continue
+        visited.add(root)
+        yield root if label is None else label(root)
+        stack = [iter(neighbors(root))]
+        while stack:
+            for node in stack[-1]:
+                if node not in visited:
+                    visited.add(node)
+                    yield node if label is None else label(node)
+                    stack.append(iter(neighbors(node)))
+                    break
+            else:
+                stack.pop()
+
+
+@instrumented
+def dfs_activation_iterative(graph, start: str) -> tuple:
+    """
+    Drop-in, recursion-free counterpart of dfs_activation().
+
+    Arguments:
+        graph (dict): An adjacency list (or CompactGraph) of module dependencies.
+        start (str): The starting module ID for activation.
+
+    Returns:
+        list: A list of module IDs in the order they are activated.
+        str: A system message indicating successful reboot.
+    """
+    return list(iter_dfs_activation(graph, [start])), _REBOOT_MESSAGE
+
+
+@instrumented
+def topological_activation(graph, starts=None) -> list:
+    """
+    Orders modules so that every module is activated before its dependents.
+
+    Runs an iterative DFS that tracks the modules on the current path; an
+    edge back onto that path is a cycle and is reported with the offending
+    path instead of looping or returning a wrong order.
+
+    Arguments:
+        graph (dict): An adjacency list (or CompactGraph) of module dependencies.
+        starts (iterable): Modules to activate together with everything they
+            reach; defaults to every module in the graph.
+
+    Returns:
+        list: Module IDs in topological activation order.
+
+    Raises:
+        DependencyCycleError: If a cycle is reachable; its path attribute holds the cycle.
+
+    Example Input:
+        {"104": ["215", "309"], "215": ["412"], "309": ["518"], "412": ["518"], "518": []}
+    Example Output:
+        ['104', '309', '215', '412', '518']
+    """
+    neighbors, roots, label = _traversal_view(graph, graph if starts is None else starts)
+    done = set()
+    postorder = []
+    for root in roots:
+        if root in done:
+            continue
+        path, on_path = [root], {root: 0}
+        stack = [iter(neighbors(root))]
+        while stack:
+            for node in stack[-1]:
+                if node in on_path:
+                    cycle = path[on_path[node]:] + [node]
+                    raise DependencyCycleError(cycle if label is None else [label(n) for n in cycle])
+                if node not in done:
+                    on_path[node] = len(path)
+                    path.append(node)
+                    stack.append(iter(neighbors(node)))
+                    break
+            else:
+                stack.pop()
+                node = path.pop()
+                del on_path[node]
+                done.add(node)
+                postorder.append(node)
+    postorder.reverse()
+    return postorder if label is None else [label(node) for node in postorder]
+
+
+# =======================================================
+# 💾 SNAPSHOTS — Versioned Binary Warm Start (Trees & Graphs)
+# =======================================================
+# Layout (little-endian): a 48-byte header, then fixed-width 8-byte columns.
+#   tree  (kind 1): ids int64[n], sizes float64[n]          (inorder)
+#   graph (kind 2): offsets int64[n + 1], targets int64[m], ids utf-8 (NUL-joined)
+# The header carries the payload CRC-32 and ends with its own CRC-32.
+_SNAPSHOT_MAGIC = b"CODEX9SN"
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_TREE = 1
+_SNAPSHOT_GRAPH = 2
+_SNAPSHOT_HEADER = struct.Struct("<8sHHIQQQI")  # magic, version, kind, reserved, n, m, names bytes, payload crc
+_SNAPSHOT_HEADER_CRC = struct.Struct("<I")
+_SNAPSHOT_HEADER_SIZE = _SNAPSHOT_HEADER.size + _SNAPSHOT_HEADER_CRC.size
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is truncated, corrupted, or of an unknown version or kind."""
+
+
+def _snapshot_words(values: array) -> array:
+    """Returns values as 8-byte little-endian words, copying only when the native layout differs."""
+    if values.itemsize != 8:
+        values = array("q", values)
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _read_words(view, offset: int, count: int, typecode: str) -> array:
+    """Copies count 8-byte words at offset into an array of typecode (one memcpy when it is 8 bytes wide)."""
+    words = array(typecode if array(typecode).itemsize == 8 else "q")
+    words.frombytes(view[offset:offset + 8 * count])
+    if sys.byteorder == "big":
+        words.byteswap()
+    return words if words.typecode == typecode else array(typecode, words)
+
+
+def _write_snapshot(path: str, kind: int, n: int, m: int, parts: list, names_size: int = 0):
+    payload_crc = 0
+    for part in parts:
+        payload_crc = zlib.crc32(part, payload_crc)
+    header = _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, kind, 0, n, m, names_size, payload_crc)
+    # Write next to the target and rename, so readers never see a half-written snapshot.
+    descriptor, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as handle:
+            handle.write(header)
+            handle.write(_SNAPSHOT_HEADER_CRC.pack(zlib.crc32(header)))
+            for part in parts:
+                handle.write(part)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _check_snapshot(view, path: str, kind: int) -> tuple:
+    """Validates a mapped snapshot's header and checksums; returns (n, m, names_size)."""
+    with view[:_SNAPSHOT_HEADER.size] as header:
+        magic, version, found_kind, _, n, m, names_size, payload_crc = _SNAPSHOT_HEADER.unpack(header)
+        if magic != _SNAPSHOT_MAGIC:
+            raise SnapshotError("%s: not a Codex-9 snapshot" % path)
+        if _SNAPSHOT_HEADER_CRC.unpack_from(view, _SNAPSHOT_HEADER.size)[0] != zlib.crc32(header):
+            raise SnapshotError("%s: header checksum mismatch" % path)
+    if version != _SNAPSHOT_VERSION:
+        raise SnapshotError("%s: unsupported snapshot version %d" % (path, version))
+    if found_kind != kind:
+        raise SnapshotError("%s: snapshot holds kind %d, expected %d" % (path, found_kind, kind))
+    expected = 16 * n if kind == _SNAPSHOT_TREE else 8 * (n + 1 + m) + names_size
+    with view[_SNAPSHOT_HEADER_SIZE:] as payload:
+        if len(payload) != expected:
+            raise SnapshotError("%s: payload is %d bytes, expected %d" % (path, len(payload), expected))
+        if zlib.crc32(payload) != payload_crc:
+            raise SnapshotError("%s: payload checksum mismatch" % path)
+    return n, m, names_size
+
+
+@contextlib.contextmanager
+def _mapped_snapshot(path: str, kind: int):
+    """Memory-maps and validates a snapshot; yields (view, n, m, names_size)."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size < _SNAPSHOT_HEADER_SIZE:
+            raise SnapshotError("%s: truncated snapshot header" % path)
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield (view,) + _check_snapshot(view, path, kind)
+            finally:
+                view.release()
+
+
+def save_tree_snapshot(tree, path: str):
+    """
+    Writes an integrity tree to a binary snapshot file.
+
+    Arguments:
+        tree (IntegrityTree | BSTNode | AVLNode): The tree, or the root node of one.
+        path (str): Destination file (replaced atomically).
+    """
+    pairs = tree if isinstance(tree, IntegrityTree) else iter_inorder_bst(tree)
+    ids, sizes = array("q"), array("d")
+    for key, value in pairs:
+        ids.append(key)
+        sizes.append(value)
+    _write_snapshot(path, _SNAPSHOT_TREE, len(ids), 0, [_snapshot_words(ids), _snapshot_words(sizes)])
+
+
+def load_tree_snapshot(path: str) -> IntegrityTree:
+    """
+    Loads a tree snapshot into a balanced IntegrityTree in O(n).
+
+    The file is memory-mapped and its columns are copied out in bulk; the
+    tree is then bulk-loaded from the stored inorder sequence, so there is
+    no per-record parsing or rebalancing. Its root is also a valid input
+    for inorder_bst() and iter_inorder_bst().
+
+    Arguments:
+        path (str): Snapshot file written by save_tree_snapshot().
+
+    Returns:
+        IntegrityTree: A tree with the same inorder (id, size) pairs.
+    """
+    with _mapped_snapshot(path, _SNAPSHOT_TREE) as (view, n, _, _):
+        ids = _read_words(view, _SNAPSHOT_HEADER_SIZE, n, "q")
+        sizes = _read_words(view, _SNAPSHOT_HEADER_SIZE + 8 * n, n, "d")
+    return IntegrityTree.from_sorted(list(zip(ids.tolist(), sizes.tolist())))
+
+
+def save_graph_snapshot(graph, path: str):
+    """
+    Writes a dependency graph to a binary snapshot file in CSR form.
+
+    Arguments:
+        graph (dict | CompactGraph): Adjacency list from build_dependency_graph, or its CSR form.
+        path (str): Destination file (replaced atomically).
+
+    Raises:
+        ValueError: If a module ID is not a str or contains a NUL character.
+    """
+    graph = graph if isinstance(graph, CompactGraph) else CompactGraph(graph)
+    for module_id in graph.ids:
+        if not isinstance(module_id, str) or "\0" in module_id:
+            raise ValueError("graph snapshots need str module IDs without NUL characters, got %r" % (module_id,))
+    names = "\0".join(graph.ids).encode("utf-8")
+    parts = [_snapshot_words(graph.offsets), _snapshot_words(graph.targets), names]
+    _write_snapshot(path, _SNAPSHOT_GRAPH, len(graph), graph.edge_count, parts, len(names))
+
+
+def load_graph_snapshot(path: str) -> CompactGraph:
+    """
+    Loads a graph snapshot into a CompactGraph in O(n + m).
+
+    Arguments:
+        path (str): Snapshot file written by save_graph_snapshot().
+
+    Returns:
+        CompactGraph: The graph, with the same IDs and dependent order as the saved one.
+    """
+    with _mapped_snapshot(path, _SNAPSHOT_GRAPH) as (view, n, m, names_size):
+        offset = _SNAPSHOT_HEADER_SIZE
+        offsets = _read_words(view, offset, n + 1, "l")
+        targets = _read_words(view, offset + 8 * (n + 1), m, "l")
+        names = str(view[offset + 8 * (n + 1 + m):], "utf-8")
+    graph = CompactGraph()
+    graph.ids = names.split("\0") if n else []
+    graph.index = {module_id: position for position, module_id in enumerate(graph.ids)}
+    graph.offsets = offsets
+    graph.targets = targets
+    return graph
+
+
+# =======================================================
+# 🚀 PIPELINE — End-to-End Restoration Runner (Tasks 1–10)
+# =======================================================
+class _StageMeter:
+    """Wraps a stage's output iterator and records time, item count and peak memory.
+
+    The time spent in the wrapped next() includes pulling from upstream
+    stages; run_pipeline() subtracts the upstream total afterwards. The
+    tracemalloc peak is read and reset after every next() of every meter,
+    so each reading covers only the work done since the previous stage
+    handed over an item.
+    """
+    def __init__(self, task: int, name: str, iterable, upstream=None, trace_memory: bool = False):
+        self.task = task
+        self.name = name
+        self.upstream = upstream
+        self.trace_memory = trace_memory
+        self.iterator = iter(iterable)
+        self.seconds = 0.0
+        self.items = 0
+        self.peak_bytes = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            item = next(self.iterator)
+        finally:
+            self.seconds += time.perf_counter() - started
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.reset_peak()
+                self.peak_bytes = max(self.peak_bytes, peak)
+        self.items += 1
+        return item
+
+    def report(self) -> dict:
+        upstream = self.upstream.seconds if self.upstream is not None else 0.0
+        return {
+            "task": self.task,
+            "stage": self.name,
+            "seconds": max(self.seconds - upstream, 0.0),
+            "items": self.items,
+            "peak_bytes": self.peak_bytes if self.trace_memory else None,
+        }
+
+
+def _iter_module_numbers(handle):
+    """Lazily parses integers separated by whitespace, commas or JSON list brackets."""
+    cleanup = str.maketrans(",[]", "   ")
+    for line in handle:
+        for token in line.translate(cleanup).split():
+            yield int(token)
+
+
+def _smallest_module_id(graph) -> str:
+    """The default DFS start: the module ID with the smallest numeric value."""
+    if not graph:
+        raise ValueError("the dependency graph is empty")
+    return min(graph, key=int)
+
+
+def _delayed_actions(module_ids, undo: int = 3):
+    """
+    Streams the Task 5 action log: 'load_<id>' / 'verify_<id>' alternately,
+    holding back the last `undo` actions so they are never emitted (undone).
+    """
+    held = deque()
+    for position, module_id in enumerate(module_ids):
+        held.append(("load_%s" if position % 2 == 0 else "verify_%s") % module_id)
+        if len(held) > undo:
+            yield held.popleft()
+
+
+def _actions_with_metadata(actions, metadata: dict):
+    """Streams (action, module_id, metadata) for actions whose module has metadata."""
+    for action in actions:
+        module_id = int(action.rpartition("_")[2])
+        info = metadata.get(module_id)
+        if info is not None:
+            yield action, module_id, info
+
+
+def _deferred(function, *args):
+    """Calls function(*args) on the first next() and streams its result, so a meter can time it."""
+    yield from function(*args)
+
+
+@instrumented
+def run_pipeline(fragment_source, module_numbers, metadata: dict, connection_map: dict,
+                 start: str = None, chunk_size: int = 1 << 16, trace_memory: bool = True):
+    """
+    Runs the ten Codex-9 restoration tasks end to end and profiles each stage.
+
+    Tasks 1–6 are chained as generators, so words, modules and actions flow
+    through one at a time; Task 7 (sorting) is the first stage that has to
+    materialize its input. Task 8 bulk-loads the sorted pairs into an
+    IntegrityTree, and Tasks 9–10 build a CompactGraph from the connection
+    map and run the iterative DFS from `start`.
+
+    Arguments:
+        fragment_source: File object (or mmap) holding the semicolon-separated fragment.
+        module_numbers (iterable): Module IDs paired with the decoded words.
+        metadata (dict): Maps integer module IDs to {"size": ..., ...} metadata.
+        connection_map (dict): Maps module IDs to lists of dependent module IDs.
+        start (str): DFS start module; defaults to the smallest numeric module ID.
+        chunk_size (int): Read size used by the streaming decoder.
+        trace_memory (bool): Record tracemalloc peaks per stage (slows the run down).
+
+    Returns:
+        dict: 'modules' (inorder (id, size) pairs), 'activation_order' and 'message'.
+        list: One report dict per stage with 'task', 'stage', 'seconds', 'items' and 'peak_bytes'.
+    """
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        if trace_memory:
+            tracemalloc.reset_peak()
+
+        def meter(task, name, iterable, upstream=None):
+            return _StageMeter(task, name, iterable, upstream, trace_memory)
+
+        words = meter(1, "decode_fragment",
+                      (word.strip() for word in decode_fragment_stream(fragment_source, chunk_size)))
+        segments = meter(2, "organize_segments", zip(words, module_numbers), words)
+        unique = meter(3, "unique_modules", unique_modules_stream(segments), segments)
+        restored = meter(4, "build_restoration_queue", (module[1] for module in unique), unique)
+        actions = meter(5, "track_actions", _delayed_actions(restored), restored)
+        mapped = meter(6, "map_actions_to_metadata", _actions_with_metadata(actions, metadata), actions)
+        ordered = meter(7, "quick_sort_modules",
+                        _deferred(introsort_modules,
+                                  ((module_id, info["size"]) for _, module_id, info in mapped)),
+                        mapped)
+        inorder = meter(8, "inorder_bst", _deferred(IntegrityTree.from_sorted, ordered), ordered)
+        modules = list(inorder)
+
+        graph_meter = meter(9, "build_dependency_graph",
+                            _deferred(lambda: (CompactGraph(connection_map),)))
+        graph = next(graph_meter)
+        graph_meter.items = len(graph)
+        if start is None:
+            start = _smallest_module_id(graph)
+        activation = meter(10, "dfs_activation", iter_dfs_activation(graph, [start]))
+        order = list(activation)
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    report = [stage.report() for stage in
+              (words, segments, unique, restored, actions, mapped, ordered, inorder, graph_meter, activation)]
+    result = {"modules": modules, "activation_order": order, "message": _REBOOT_MESSAGE}
+    return result, report
+
+
+def main(argv=None) -> int:
+    """Command-line entry point: python -m codex9 FRAGMENT --modules ... --metadata ... --graph ..."""
+    parser = argparse.ArgumentParser(
+        prog="python -m codex9",
+        description="Run the Codex-9 restoration pipeline and report per-stage cost.")
+    parser.add_argument("fragment", help="file with the semicolon-separated corrupted fragment")
+    parser.add_argument("--modules", required=True,
+                        help="file with the module IDs (whitespace/comma separated or a JSON list)")
+    parser.add_argument("--metadata", required=True, help="JSON file mapping module IDs to metadata")
+    parser.add_argument("--graph", required=True, help="JSON file mapping module IDs to dependent IDs")
+    parser.add_argument("--start", help="DFS start module (default: smallest numeric module ID)")
+    parser.add_argument("--chunk-size", type=int, default=1 << 16, help="fragment read size in bytes")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc peak tracking")
+    parser.add_argument("--json", action="store_true", help="print the stage report as JSON")
+    args = parser.parse_args(argv)
+
+    with open(args.metadata, encoding="utf-8") as handle:
+        metadata = {int(module_id): info for module_id, info in json.load(handle).items()}
+    with open(args.graph, encoding="utf-8") as handle:
+        connection_map = json.load(handle)
+
+    with open(args.fragment, "rb") as fragment, open(args.modules, encoding="utf-8") as numbers:
+        result, report = run_pipeline(fragment, _iter_module_numbers(numbers), metadata, connection_map,
+                                      start=args.start, chunk_size=args.chunk_size,
+                                      trace_memory=not args.no_memory)
+
+    if args.json:
+        json.dump({"stages": report, "activated": len(result["activation_order"]),
+                   "message": result["message"]}, sys.stdout, indent=2)
+        print()
+        return 0
+
+    print("%-4s %-26s %12s %12s %14s" % ("task", "stage", "seconds", "items", "peak bytes"))
+    for stage in report:
+        peak = "-" if stage["peak_bytes"] is None else stage["peak_bytes"]
+        print("%-4d %-26s %12.6f %12d %14s" % (stage["task"], stage["stage"], stage["seconds"],
+                                               stage["items"], peak))
+    print("Activated %d modules. %s" % (len(result["activation_order"]), result["message"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,31 @@
+import asyncio
+import io
+import json
+import mmap
+import os
+import random
+import tempfile
+import threading
 import unittest
+import codex9
 from codex9 import (decode_fragment, organize_segments, unique_modules, 
                        build_restoration_queue, track_actions, 
                        map_actions_to_metadata, quick_sort_modules, 
                        insert_bst, inorder_bst, build_dependency_graph, 
                        dfs_activation)
+import bench_codex9
+from codex9 import (decode_fragment_stream, unique_modules_stream, decode_fragment_cached,
+                    enable_decode_cache, disable_decode_cache, clear_decode_cache,
+                    decode_cache_info,
+                    RestorationPool, restore_modules_concurrent, ActionLog,
+                    ActionMetadataIndex,
+                    introsort_modules, top_k_modules, IntegrityTree,
+                    iter_inorder_bst, BSTNode, CompactGraph,
+                    iter_dfs_activation, dfs_activation_iterative,
+                    topological_activation, DependencyCycleError, run_pipeline,
+                    enable_metrics, disable_metrics, reset_metrics, collect_metrics,
+                    metrics_snapshot, export_metrics, save_tree_snapshot, load_tree_snapshot,
+                    save_graph_snapshot, load_graph_snapshot, SnapshotError)
 
 class TestCodex9Project(unittest.TestCase):
     """Unit tests for the codex9 mini-project tasks.
@@ -103,5 +125,421 @@ class TestCodex9Project(unittest.TestCase):
         self.assertNotEqual(visited[0], '518')
         self.assertEqual(msg, "Blueprint successfully restored. Codex-9 reboot complete.")
 
+class TestCodex9Engines(unittest.TestCase):
+    """Unit tests for the scalable engines that accompany the codex9 tasks.
+
+    Methods:
+        test_task1_decode_fragment_stream: Tests chunked decoding across chunk boundaries.
+        test_task1_decode_fragment_stream_binary: Tests decoding from bytes and mmap sources.
+        test_task1_decode_cache: Tests memoized decoding, statistics, clearing and disabling.
+        test_task3_unique_modules_stream: Tests order-preserving dedup in memory and spilled to disk.
+        test_task4_restoration_pool: Tests deterministic order and per-run counters of the worker pool.
+        test_task4_restoration_pool_async: Tests the asyncio backend with a coroutine callback.
+        test_task5_action_log: Tests packed storage, multi-undo/redo and legacy rendering.
+        test_task5_action_log_checkpoints: Tests checkpoints and redo-tail truncation.
+        test_task6_action_metadata_index: Tests lazy, read-only views and the parse cache.
+        test_task7_introsort_modules: Tests introsort on random, sorted and duplicate-heavy inputs.
+        test_task7_top_k_modules: Tests the partial-sort mode.
+        test_task8_integrity_tree_balanced: Tests that sorted insertion keeps the AVL tree shallow.
+        test_task8_integrity_tree_bulk_load_and_range: Tests bulk loading and size range queries.
+        test_task8_iter_inorder_bst: Tests lazy, reverse and lower-bounded traversal of a degenerate BST.
+        test_task8_tree_snapshot: Tests the binary tree snapshot round trip and its checksums.
+        test_task9_compact_graph: Tests CSR storage and dict-compatible neighbor lookups.
+        test_task9_graph_snapshot: Tests the binary CSR graph snapshot round trip.
+        test_task10_dfs_activation_iterative: Tests recursion-free preorder on deep chains and CSR graphs.
+        test_task10_topological_activation: Tests topological order and cycle reporting.
+        test_pipeline_run: Tests the end-to-end streaming pipeline and its stage report.
+        test_benchmark_suite: Smoke-tests the benchmark runner and baseline comparison.
+        test_metrics_instrumentation: Tests opt-in call/latency/size/peak metrics and JSON export.
+        test_metrics_recursion_and_threads: Tests outermost-call recording and per-thread bookkeeping.
+    """
+
+    def test_task1_decode_fragment_stream(self):
+        fragment = "edoc;nohtyp;ataD;erutcurts;smhtiroglA"
+        expected = ['code', 'python', 'Data', 'structure', 'Algorithms']
+        for chunk_size in (1, 3, 7, 1 << 16):
+            words = list(decode_fragment_stream(io.StringIO(fragment), chunk_size))
+            self.assertEqual(words, expected)
+        self.assertEqual(list(decode_fragment_stream(io.StringIO(";ba;;"), 2)), ['', 'ab', '', ''])
+
+    def test_task1_decode_fragment_stream_binary(self):
+        data = "olleh;dlrow;éfac".encode("utf-8")
+        self.assertEqual(list(decode_fragment_stream(io.BytesIO(data), 2)), ['hello', 'world', 'café'])
+        fd, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self.assertEqual(list(decode_fragment_stream(mm, 4)), ['hello', 'world', 'café'])
+        finally:
+            os.remove(path)
+
+    def test_task1_decode_cache(self):
+        try:
+            enable_decode_cache(maxsize=2)
+            self.assertEqual(decode_fragment_cached("edoc;nohtyp;edoc;edoc"), ['code', 'python', 'code', 'code'])
+            info = decode_cache_info()
+            self.assertEqual((info.hits, info.misses, info.currsize), (2, 2, 2))
+            self.assertEqual(list(decode_fragment_stream(io.StringIO("nohtyp;ataD"), 3)), ['python', 'Data'])
+            self.assertEqual(decode_cache_info().hits, 3)
+            clear_decode_cache()
+            self.assertEqual(decode_cache_info().currsize, 0)
+        finally:
+            disable_decode_cache()
+        self.assertIsNone(decode_cache_info())
+        self.assertEqual(decode_fragment_cached("olleh;dlrow"), ['hello', 'world'])
+
+    def test_task3_unique_modules_stream(self):
+        data = [('python', 215), ('code', 104), ('python', 215), ('Data', 309), ('code', 104)]
+        expected = [('python', 215), ('code', 104), ('Data', 309)]
+        self.assertEqual(list(unique_modules_stream(iter(data))), expected)
+        self.assertEqual(list(unique_modules_stream(data, partitions=3)), expected)
+
+        data = [('w%d' % (i % 37), i % 37) for i in range(500)]
+        self.assertEqual(list(unique_modules_stream(data, partitions=4)),
+                         list(unique_modules_stream(data)))
+
+    def test_task4_restoration_pool(self):
+        data = [('code', 104), ('python', 215), ('Data', 309), ('bad', 412), ('ok', 518)]
+        self.assertEqual(restore_modules_concurrent(data[:3]), [104, 215, 309])
+
+        def restore(module):
+            if module[1] == 412:
+                raise RuntimeError("checksum mismatch")
+
+        pool = RestorationPool(restore, workers=3, max_pending=2)
+        self.assertEqual(pool.run(iter(data)), [104, 215, 309, 518])
+        self.assertEqual((pool.counters["queued"], pool.counters["restored"], pool.counters["failed"]), (5, 4, 1))
+        self.assertEqual(pool.failures[0][0], 412)
+        self.assertEqual(pool.run([('again', 104)]), [104])
+        self.assertEqual((pool.counters["queued"], pool.counters["restored"], pool.counters["failed"]), (1, 1, 0))
+        self.assertEqual(pool.failures, [])
+
+    def test_task4_restoration_pool_async(self):
+        data = [('w%d' % i, i) for i in range(50)]
+
+        async def restore(module):
+            await asyncio.sleep(0.001 * (module[1] % 3))
+
+        self.assertEqual(restore_modules_concurrent(data, restore, workers=8, use_asyncio=True),
+                         list(range(50)))
+
+    def test_task5_action_log(self):
+        log = ActionLog.from_module_ids([104, 215, 309, 412, 518])
+        self.assertEqual(log.render(), ['load_104', 'verify_215', 'load_309', 'verify_412', 'load_518'])
+        self.assertEqual(log.undo(3), 3)
+        self.assertEqual(log.render(), ['load_104', 'verify_215'])
+        self.assertEqual(log.redo(2), 2)
+        self.assertEqual(log[-1], 'verify_412')
+        self.assertEqual(log.undo(10), 4)
+        self.assertEqual(len(log), 0)
+        self.assertEqual(log.redo(10), 5)
+        self.assertEqual(len(log), 5)
+
+    def test_task5_action_log_checkpoints(self):
+        log = ActionLog()
+        log.push(ActionLog.LOAD, 7)
+        log.checkpoint("base")
+        log.push(ActionLog.VERIFY, 7)
+        log.push(ActionLog.LOAD, 12)
+        log.checkpoint("late")
+        log.rollback("base")
+        self.assertEqual(log.render(), ['load_7'])
+        log.push(ActionLog.VERIFY, 99)
+        self.assertEqual(log.render(), ['load_7', 'verify_99'])
+        self.assertEqual(log.redo(), 0)
+        with self.assertRaises(KeyError):
+            log.rollback("late")
+        with self.assertRaises(ValueError):
+            log.push(5, 1)
+
+    def test_task6_action_metadata_index(self):
+        metadata = {
+            104: {"size": 3.4, "status": "ok"},
+            215: {"size": 5.2, "status": "ok"}
+        }
+        index = ActionMetadataIndex(maxsize=8)
+        view = index.view(['load_104', 'verify_215', 'load_999'], metadata)
+        self.assertEqual(dict(view), {'load_104': metadata[104], 'verify_215': metadata[215]})
+        self.assertIs(view['load_104'], metadata[104])
+        self.assertNotIn('load_999', view)
+        self.assertEqual(len(view), 2)
+        with self.assertRaises(TypeError):
+            view['load_104'] = {}
+        metadata[999] = {"size": 1.0, "status": "late"}
+        self.assertEqual(view['load_999']['status'], 'late')
+
+        views = index.map_batches([['load_104'], ['load_104', 'verify_215']], metadata)
+        self.assertEqual([len(v) for v in views], [1, 2])
+        info = index.cache_info()
+        self.assertEqual((info.hits, info.misses), (3, 3))
+
+    def test_task7_introsort_modules(self):
+        modules = [(104, 3.4), (215, 5.2), (309, 2.1)]
+        self.assertEqual(introsort_modules(modules), [(309, 2.1), (104, 3.4), (215, 5.2)])
+
+        rng = random.Random(7)
+        n = 20000
+        inputs = [
+            [(i, rng.random()) for i in range(n)],
+            [(i, float(i)) for i in range(n)],
+            [(i, float(n - i)) for i in range(n)],
+            [(i, float(rng.randrange(3))) for i in range(n)],
+            [(i, 1.0) for i in range(n)],
+        ]
+        for data in inputs:
+            result = introsort_modules(data)
+            self.assertEqual([size for _, size in result], sorted(size for _, size in data))
+            self.assertEqual(sorted(result), sorted(data))
+
+    def test_task7_top_k_modules(self):
+        modules = [(104, 3.4), (215, 5.2), (309, 2.1), (412, 2.1)]
+        self.assertEqual(top_k_modules(modules, 3), [(309, 2.1), (412, 2.1), (104, 3.4)])
+        self.assertEqual(top_k_modules(iter(modules), 0), [])
+
+    def test_task8_integrity_tree_balanced(self):
+        tree = IntegrityTree([(309, 2.1), (104, 3.4), (215, 5.2)])
+        self.assertEqual(tree.inorder(), [(309, 2.1), (104, 3.4), (215, 5.2)])
+
+        tree = IntegrityTree()
+        for i in range(10000):
+            tree.insert(i, float(i // 3))
+        self.assertEqual(len(tree), 10000)
+        self.assertLessEqual(tree.height, 20)
+        self.assertEqual(list(tree), [(i, float(i // 3)) for i in range(10000)])
+
+    def test_task8_integrity_tree_bulk_load_and_range(self):
+        pairs = [(i, float(i)) for i in range(1023)]
+        tree = IntegrityTree.from_sorted(pairs)
+        self.assertEqual(tree.height, 10)
+        self.assertEqual(list(tree), pairs)
+        self.assertEqual(list(tree.range(10.0, 13.5)), pairs[10:14])
+        self.assertEqual(list(tree.range(high=2.0)), pairs[:3])
+        self.assertEqual(list(tree.range(2000.0, 3000.0)), [])
+        with self.assertRaises(ValueError):
+            IntegrityTree.from_sorted([(1, 2.0), (2, 1.0)])
+
+    def test_task8_iter_inorder_bst(self):
+        # A 5000-node right spine, far deeper than the recursion limit allows.
+        root = BSTNode(0, 0.0)
+        tail = root
+        for i in range(1, 5000):
+            tail.right = BSTNode(i, float(i))
+            tail = tail.right
+        pairs = [(i, float(i)) for i in range(5000)]
+        self.assertEqual(list(iter_inorder_bst(root)), pairs)
+        self.assertEqual(list(iter_inorder_bst(root, reverse=True)), pairs[::-1])
+        self.assertEqual(list(iter_inorder_bst(root, start=4997.5)), pairs[4998:])
+        self.assertEqual(list(iter_inorder_bst(root, reverse=True, start=1.0)), pairs[1::-1])
+        self.assertEqual(list(iter_inorder_bst(None)), [])
+
+        tree = IntegrityTree.from_sorted(pairs)
+        self.assertEqual(list(reversed(tree))[:3], pairs[:-4:-1])
+        self.assertEqual(list(iter_inorder_bst(tree.root, start=2500.0))[:2], pairs[2500:2502])
+
+    def test_task8_tree_snapshot(self):
+        rng = random.Random(8)
+        pairs = [(i, float(rng.randrange(40))) for i in range(500)]
+        tree = IntegrityTree(pairs)
+        root = BSTNode(215, 5.2)
+        root.left, root.right = BSTNode(104, 3.4), BSTNode(412, 7.3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tree.snap")
+            save_tree_snapshot(tree, path)
+            loaded = load_tree_snapshot(path)
+            self.assertEqual(loaded.inorder(), tree.inorder())
+            self.assertEqual(loaded.height, 9)
+            loaded.insert(999, -1.0)
+            self.assertEqual(next(iter_inorder_bst(loaded.root)), (999, -1.0))
+
+            save_tree_snapshot(root, path)
+            self.assertEqual(load_tree_snapshot(path).inorder(), [(104, 3.4), (215, 5.2), (412, 7.3)])
+            save_tree_snapshot(None, path)
+            self.assertEqual(len(load_tree_snapshot(path)), 0)
+
+            with open(path, "r+b") as handle:
+                handle.seek(9)
+                handle.write(b"\x07")
+            with self.assertRaises(SnapshotError):
+                load_tree_snapshot(path)
+            with open(path, "wb") as handle:
+                handle.write(b"CODEX9SN")
+            with self.assertRaises(SnapshotError):
+                load_tree_snapshot(path)
+
+    def test_task9_compact_graph(self):
+        connections = {
+            "104": ["215", "309"],
+            "215": ["412"],
+            "309": ["518"],
+            "412": ["518"],
+        }
+        graph = CompactGraph(connections)
+        self.assertEqual(list(graph.offsets), [0, 2, 3, 4, 5, 5])
+        self.assertEqual(graph.edge_count, 5)
+        self.assertEqual(graph["104"], ["215", "309"])
+        self.assertEqual(graph["518"], [])
+        self.assertEqual(graph.get("999", []), [])
+        self.assertIn("518", graph["412"])
+        self.assertEqual(dict(graph), dict(connections, **{"518": []}))
+        self.assertEqual([graph.ids[t] for t in graph.successors(graph.index["104"])], ["215", "309"])
+
+    def test_task9_graph_snapshot(self):
+        graph = {"104": ["215", "309"], "215": ["412"], "309": ["518"], "412": ["518"], "518": [], "é": ["999"]}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.snap")
+            save_graph_snapshot(graph, path)
+            loaded = load_graph_snapshot(path)
+            self.assertEqual(dict(loaded), dict(graph, **{"999": []}))
+            self.assertEqual(loaded.edge_count, 6)
+            self.assertEqual(dfs_activation_iterative(loaded, "104")[0], ['104', '215', '412', '518', '309'])
+            with self.assertRaises(SnapshotError):
+                load_tree_snapshot(path)
+
+            with open(path, "r+b") as handle:
+                handle.seek(-2, os.SEEK_END)
+                handle.write(b"#")
+            with self.assertRaises(SnapshotError):
+                load_graph_snapshot(path)
+            save_graph_snapshot(CompactGraph(), path)
+            self.assertEqual(len(load_graph_snapshot(path)), 0)
+            with self.assertRaises(ValueError):
+                save_graph_snapshot({104: [215]}, path)
+
+    def test_task10_dfs_activation_iterative(self):
+        graph = {
+            "104": ["215", "309"],
+            "215": ["412"],
+            "309": ["518"],
+            "412": ["518"],
+            "518": []
+        }
+        expected = ['104', '215', '412', '518', '309']
+        self.assertEqual(dfs_activation_iterative(graph, "104"),
+                         (expected, "Blueprint successfully restored. Codex-9 reboot complete."))
+        self.assertEqual(dfs_activation_iterative(CompactGraph(graph), "104")[0], expected)
+        for g in (graph, CompactGraph(graph)):
+            self.assertEqual(dfs_activation_iterative(g, "999")[0], ["999"])
+            self.assertEqual(list(iter_dfs_activation(g, ["999", "412", "999"])), ["999", "412", "518"])
+            self.assertEqual(topological_activation(g, ["999", "412"]), ["412", "518", "999"])
+        self.assertEqual(list(iter_dfs_activation(graph, ["309", "104", "518"])),
+                         ['309', '518', '104', '215', '412'])
+
+        chain = {str(i): [str(i + 1)] for i in range(20000)}
+        order, _ = dfs_activation_iterative(chain, "0")
+        self.assertEqual(len(order), 20001)
+        self.assertEqual(order[-1], "20000")
+
+    def test_task10_topological_activation(self):
+        graph = {
+            "104": ["215", "309"],
+            "215": ["412"],
+            "309": ["518"],
+            "412": ["518"],
+            "518": []
+        }
+        for g in (graph, CompactGraph(graph)):
+            order = topological_activation(g)
+            position = {module: i for i, module in enumerate(order)}
+            self.assertEqual(sorted(order), sorted(graph))
+            for module, dependents in graph.items():
+                for dependent in dependents:
+                    self.assertLess(position[module], position[dependent])
+        self.assertEqual(topological_activation(graph, ["309"]), ['309', '518'])
+
+        cyclic = dict(graph, **{"518": ["215"]})
+        with self.assertRaises(DependencyCycleError) as ctx:
+            topological_activation(cyclic, ["104"])
+        self.assertEqual(ctx.exception.path, ['215', '412', '518', '215'])
+
+    def test_pipeline_run(self):
+        metadata = {
+            104: {"size": 3.4, "status": "ok"},
+            215: {"size": 5.2, "status": "ok"},
+            309: {"size": 2.1, "status": "ok"},
+            412: {"size": 7.3, "status": "ok"},
+            518: {"size": 4.8, "status": "ok"},
+        }
+        graph = {"104": ["215", "309"], "215": ["412"], "309": ["518"], "412": ["518"], "518": []}
+        fragment = io.StringIO("edoc;nohtyp;ataD;erutcurts;smhtiroglA;nohtyp\n")
+        result, report = run_pipeline(fragment, [104, 215, 309, 412, 518, 215], metadata, graph,
+                                      chunk_size=5)
+        self.assertEqual(result["modules"], [(104, 3.4), (215, 5.2)])
+        self.assertEqual(result["activation_order"], ['104', '215', '412', '518', '309'])
+        self.assertEqual([stage["task"] for stage in report], list(range(1, 11)))
+        self.assertEqual([stage["items"] for stage in report], [6, 6, 5, 5, 2, 2, 2, 2, 5, 5])
+        self.assertTrue(all(stage["seconds"] >= 0 and stage["peak_bytes"] > 0 for stage in report))
+
+    def test_benchmark_suite(self):
+        current = bench_codex9.run_benchmarks(sizes=[300], repeat=1, trace_memory=False)
+        rows = current["results"]
+        self.assertEqual(len(rows), 9)
+        self.assertTrue(all(row["status"] == "ok" for row in rows))
+        self.assertEqual(bench_codex9.compare_results(current, current), [])
+
+        faster = {"results": [dict(row, seconds=row["seconds"] / 10) for row in rows]}
+        regressions = bench_codex9.compare_results(current, faster, tolerance=0.5)
+        self.assertEqual(len(regressions), 9)
+
+    def test_metrics_instrumentation(self):
+        reset_metrics()
+        codex9.introsort_modules([(1, 2.0), (2, 1.0)])
+        self.assertEqual(metrics_snapshot(), {})
+        self.assertIs(codex9.introsort_modules, introsort_modules)
+
+        with collect_metrics(trace_memory=True):
+            for n in (10, 100, 1000):
+                codex9.introsort_modules([(i, float(-i)) for i in range(n)])
+            codex9.top_k_modules([(1, 2.0)], 1)
+        self.assertIs(codex9.introsort_modules, introsort_modules)
+        codex9.introsort_modules([(1, 2.0)])
+        snapshot = metrics_snapshot()
+        self.assertEqual(set(snapshot), {"introsort_modules", "top_k_modules"})
+        stats = snapshot["introsort_modules"]
+        self.assertEqual((stats["calls"], stats["input_items"], stats["max_input"]), (3, 1110, 1000))
+        self.assertLessEqual(stats["p50_seconds"], stats["p95_seconds"])
+        self.assertLessEqual(stats["p99_seconds"], stats["max_seconds"])
+        self.assertAlmostEqual(stats["mean_seconds"] * 3, stats["total_seconds"])
+        self.assertGreater(stats["peak_bytes"], 0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.json")
+            export_metrics(path)
+            with open(path, encoding="utf-8") as handle:
+                self.assertEqual(json.load(handle), snapshot)
+
+        enable_metrics()
+        codex9.decode_fragment_cached("olleh")
+        disable_metrics()
+        self.assertIsNone(metrics_snapshot()["decode_fragment_cached"]["peak_bytes"])
+        reset_metrics()
+        self.assertEqual(metrics_snapshot(), {})
+
+    def test_metrics_recursion_and_threads(self):
+        def metrics_probe(depth):
+            return 0 if depth == 0 else 1 + codex9.metrics_probe(depth - 1)
+
+        codex9.metrics_probe = codex9.instrumented(metrics_probe)
+        self.addCleanup(delattr, codex9, "metrics_probe")
+        self.addCleanup(codex9._metrics_functions.pop, "metrics_probe")
+        reset_metrics()
+        self.assertEqual(codex9.metrics_probe(900), 900)  # unwrapped while disabled
+
+        def sort_many():
+            for _ in range(20):
+                codex9.introsort_modules([(i, float(i % 7)) for i in range(200)])
+
+        with collect_metrics(trace_memory=True):
+            self.assertEqual(codex9.metrics_probe(300), 300)
+            threads = [threading.Thread(target=sort_many) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        snapshot = metrics_snapshot()
+        self.assertEqual((snapshot["metrics_probe"]["calls"], snapshot["introsort_modules"]["calls"]), (1, 80))
+        self.assertEqual(codex9._metrics_thread.peak_frames, [])
+        reset_metrics()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
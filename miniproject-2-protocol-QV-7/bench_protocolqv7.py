@@ -0,0 +1,297 @@
+"""
+=========================================================
+  📈 Protocol QV-7 Differential & Throughput Harness
+=========================================================
+
+Checks the Protocol QV-7 stages against simple reference oracles and
+measures their throughput across input sizes, using only the standard
+library (timeit + tracemalloc).
+
+Every case runs on seeded synthetic data, so two runs on the same
+machine see identical inputs:
+    clean       '#'-separated streams of letters and digits
+    noisy       streams with punctuation, underscores and accented letters
+    random      uniformly random energies / edges
+    sorted      already ascending energies (worst case for a plain BST)
+    reversed    descending energies
+    duplicates  only a handful of distinct energies (checks stability)
+    chain       one long dependency chain (worst case for recursive DFS)
+
+Each result is compared with its oracle (sorted(), a naive stack DFS, a
+character filter) before it is timed; a wrong answer is reported with
+status "mismatch". By default the engines are measured
+(extract_shards_batch, merge_sort_energy_bottom_up, QuantumStatsTree,
+ShardGraph). Pass --target tasks (or all) to measure your own task
+implementations as well; unimplemented tasks are reported with status
+"unimplemented".
+
+USAGE:
+    python bench_protocolqv7.py --sizes 1000,10000,100000,1000000 --output results.json
+    python bench_protocolqv7.py --baseline results.json --tolerance 0.25
+
+With --baseline the run exits with status 1 if any case's throughput
+(items per second) falls below its baseline by more than the tolerance,
+or if any result disagrees with its oracle.
+
+=========================================================
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+
+import protocol_qv7
+
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+_NOISE = "!?$%@ _-é"
+
+
+# =======================================================
+# 🎲 Seeded Synthetic Data Generators
+# =======================================================
+def make_streams(n: int, kind: str, seed: int = 0) -> str:
+    """Returns one corrupted stream of n '#'-separated shards: 'clean' or 'noisy'."""
+    rng = random.Random(seed)
+    if kind == "clean":
+        alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    elif kind == "noisy":
+        alphabet = "abcdefXYZ0123" + _NOISE
+    else:
+        raise ValueError("unknown stream kind: %r" % kind)
+    return "#".join("".join(rng.choice(alphabet) for _ in range(rng.randrange(9)))
+                    for _ in range(n))
+
+
+def make_energies(n: int, kind: str, seed: int = 0) -> list:
+    """Returns n (code, energy) pairs: random, sorted, reversed or duplicates."""
+    rng = random.Random(seed)
+    if kind == "random":
+        return [(i, rng.random() * 100.0) for i in range(n)]
+    if kind == "sorted":
+        return [(i, i / 10.0) for i in range(n)]
+    if kind == "reversed":
+        return [(i, (n - i) / 10.0) for i in range(n)]
+    if kind == "duplicates":
+        return [(i, float(rng.randrange(4))) for i in range(n)]
+    raise ValueError("unknown energy kind: %r" % kind)
+
+
+def make_graph(n: int, kind: str, seed: int = 0, degree: int = 3) -> dict:
+    """Returns an adjacency dict over n string codes: 'random' (out-degree `degree`) or 'chain'."""
+    if kind == "chain":
+        graph = {str(i): [str(i + 1)] for i in range(n - 1)}
+        graph[str(n - 1)] = []
+        return graph
+    if kind == "random":
+        rng = random.Random(seed)
+        return {str(i): [str(rng.randrange(n)) for _ in range(degree)] for i in range(n)}
+    raise ValueError("unknown graph kind: %r" % kind)
+
+
+# =======================================================
+# 🔎 Reference Oracles
+# =======================================================
+def oracle_extract_shards(stream: str) -> list:
+    """Splits on '#', reverses each shard and keeps letters, digits, '-' and '_'."""
+    return ["".join(ch for ch in shard[::-1] if ch.isalnum() or ch in "-_")
+            for shard in stream.split("#")]
+
+
+def oracle_sort_energy(shards) -> list:
+    """Stable ascending sort by energy (also the inorder of an energy BST)."""
+    return sorted(shards, key=lambda shard: shard[1])
+
+
+def oracle_dfs(graph: dict, start: str) -> list:
+    """Naive DFS preorder with an explicit stack (same order as the recursive version)."""
+    order, visited, stack = [], set(), [start]
+    while stack:
+        node = stack.pop()
+        if node in visited:
+            continue
+        visited.add(node)
+        order.append(node)
+        stack.extend(reversed(graph.get(node, ())))
+    return order
+
+
+# =======================================================
+# ⏱️ Benchmark Cases
+# =======================================================
+def _extract_engine(stream):
+    return protocol_qv7.extract_shards_batch([stream])[0]
+
+
+def _build_tree_engine(pairs):
+    return protocol_qv7.QuantumStatsTree(pairs).inorder()
+
+
+def _build_tree_task(pairs):
+    root = None
+    for code, energy in pairs:
+        root = protocol_qv7.insert_qv(root, code, energy)
+    return protocol_qv7.inorder_qv(root)
+
+
+def _dfs_engine(graph):
+    return protocol_qv7.ShardGraph(graph).dfs_sequence("0")[0]
+
+
+def _dfs_task(graph):
+    result = protocol_qv7.dfs_sequence(graph, "0")
+    return None if result is None else result[0]
+
+
+# name -> (datasets, data factory, engine callable, task callable, oracle)
+BENCHMARKS = {
+    "extract_shards": (("clean", "noisy"), make_streams,
+                       _extract_engine, protocol_qv7.extract_shards, oracle_extract_shards),
+    "merge_sort_energy": (("random", "sorted", "reversed", "duplicates"), make_energies,
+                          protocol_qv7.merge_sort_energy_bottom_up, protocol_qv7.merge_sort_energy,
+                          oracle_sort_energy),
+    "insert_qv/inorder_qv": (("random", "sorted", "duplicates"), make_energies,
+                             _build_tree_engine, _build_tree_task, oracle_sort_energy),
+    "dfs_sequence": (("random", "chain"), make_graph,
+                     _dfs_engine, _dfs_task, lambda graph: oracle_dfs(graph, "0")),
+}
+
+
+def _measure(function, data, n: int, expected, repeat: int, trace_memory: bool) -> dict:
+    """Checks function(data) against expected, then times it (best of `repeat`)."""
+    try:
+        result = function(data)
+        if result is None:
+            return {"status": "unimplemented"}
+        if expected is not None and result != expected:
+            return {"status": "mismatch"}
+        seconds = min(timeit.Timer(lambda: function(data)).repeat(repeat=repeat, number=1))
+        peak = None
+        if trace_memory:
+            tracemalloc.start()
+            try:
+                function(data)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    except (RecursionError, MemoryError) as error:
+        return {"status": "error", "error": type(error).__name__}
+    throughput = n / seconds if seconds else float("inf")
+    return {"status": "ok", "seconds": seconds, "items_per_second": throughput, "peak_bytes": peak}
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, targets=("engine",), names=None, repeat: int = 3,
+                   seed: int = 0, trace_memory: bool = True, check: bool = True) -> dict:
+    """
+    Runs every selected case for every size and dataset kind.
+
+    Arguments:
+        sizes (iterable): Input sizes to measure.
+        targets (iterable): 'engine' and/or 'task'.
+        names (iterable): Benchmark names to run (all if None).
+        repeat (int): Timing repetitions; the best one is reported.
+        seed (int): Seed for the synthetic data generators.
+        trace_memory (bool): Also record tracemalloc peak bytes.
+        check (bool): Compare every result with its oracle before timing it.
+
+    Returns:
+        dict: {'meta': {...}, 'results': [...]} ready to be dumped as JSON.
+    """
+    results = []
+    for name, (datasets, factory, engine, task, oracle) in BENCHMARKS.items():
+        if names is not None and name not in names:
+            continue
+        for n in sizes:
+            for kind in datasets:
+                data = factory(n, kind, seed)
+                expected = oracle(data) if check else None
+                for target in targets:
+                    function = engine if target == "engine" else task
+                    row = {"bench": name, "target": target, "dataset": kind, "n": n}
+                    row.update(_measure(function, data, n, expected, repeat, trace_memory))
+                    results.append(row)
+    meta = {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "machine": platform.machine(), "seed": seed, "repeat": repeat}
+    return {"meta": meta, "results": results}
+
+
+def compare_results(current: dict, baseline: dict, tolerance: float = 0.25) -> list:
+    """
+    Lists the cases whose throughput fell below the baseline by more than tolerance.
+
+    Arguments:
+        current (dict): Output of run_benchmarks().
+        baseline (dict): A previously saved run_benchmarks() output.
+        tolerance (float): Allowed relative throughput drop (0.25 = 25%).
+
+    Returns:
+        list: One dict per regression with the baseline and current items per second and the ratio.
+    """
+    def key(row):
+        return row["bench"], row["target"], row["dataset"], row["n"]
+
+    reference = {key(row): row for row in baseline.get("results", ()) if row.get("status") == "ok"}
+    regressions = []
+    for row in current["results"]:
+        before = reference.get(key(row))
+        if before is None or row.get("status") != "ok":
+            continue
+        ratio = row["items_per_second"] / before["items_per_second"]
+        if ratio < 1.0 - tolerance:
+            regressions.append({"bench": row["bench"], "target": row["target"], "dataset": row["dataset"],
+                                "n": row["n"], "baseline": before["items_per_second"],
+                                "current": row["items_per_second"], "ratio": ratio})
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Differential and throughput harness for Protocol QV-7.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated input sizes, e.g. 1000,10000,100000,1000000")
+    parser.add_argument("--target", choices=("engine", "tasks", "all"), default="engine",
+                        help="measure the engines, your task functions, or both")
+    parser.add_argument("--bench", action="append", choices=sorted(BENCHMARKS),
+                        help="run only this benchmark (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions (best is kept)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the data generators")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc peak measurement")
+    parser.add_argument("--no-check", action="store_true", help="skip the oracle comparison")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--baseline", help="compare against a saved JSON result file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative throughput drop")
+    args = parser.parse_args(argv)
+
+    targets = {"engine": ("engine",), "tasks": ("task",), "all": ("engine", "task")}[args.target]
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    current = run_benchmarks(sizes, targets, args.bench, args.repeat, args.seed,
+                             not args.no_memory, not args.no_check)
+    text = json.dumps(current, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+
+    status = 0
+    for row in current["results"]:
+        if row["status"] == "mismatch":
+            print("MISMATCH %(bench)s [%(target)s/%(dataset)s n=%(n)d]" % row, file=sys.stderr)
+            status = 1
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        for row in compare_results(current, baseline, args.tolerance):
+            print("REGRESSION %(bench)s [%(target)s/%(dataset)s n=%(n)d]: "
+                  "%(baseline).0f/s -> %(current).0f/s (x%(ratio).2f)" % row, file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
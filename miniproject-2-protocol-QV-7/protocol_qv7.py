@@ -37,14 +37,202 @@ INSTRUCTIONS:
 =========================================================
 """
 
+from array import array
 from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import contextlib
+import functools
+import itertools
 import json
+import math
 import heapq
+import mmap
+import os
+import random
+import re
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+
+
+# =======================================================
+# 📊 INSTRUMENTATION — Opt-in Per-Task Metrics
+# =======================================================
+# @instrumented registers a task function; enable_metrics() rebinds each
+# registered module-level name to a measuring wrapper until
+# disable_metrics(). Disabled runs call the plain functions, so recursive
+# task solutions keep their native stack depth. Call through the module
+# (protocol_qv7.merge_sort_energy) to have a function measured; names
+# imported before enable_metrics() stay unwrapped.
+#
+# The registry is per process and single-threaded, like the rest of
+# Protocol QV-7: the process-pool workers of extract_shards_batch and
+# ActivationPool record nothing here.
+_metrics_functions = {}  # name -> original function of every @instrumented task
+_metrics_enabled = False
+_metrics_trace_memory = False
+_metrics_owns_tracing = False  # True if enable_metrics() started tracemalloc
+_metrics_registry = {}
+_metrics_active = set()        # names of the measured calls currently running
+_metrics_peak_frames = []      # highest peak seen inside each active traced call
+_METRICS_SAMPLE_LIMIT = 4096
+
+
+def enable_metrics(trace_memory: bool = False):
+    """
+    Starts recording metrics for every instrumented task function.
+
+    Only the outermost call of a function is recorded, so a recursive
+    merge_sort_energy or dfs_sequence counts once per top-level call.
+
+    Arguments:
+        trace_memory (bool): Also record tracemalloc peak bytes per call
+            (starts tracemalloc if needed; slows calls down noticeably).
+    """
+    global _metrics_enabled, _metrics_trace_memory, _metrics_owns_tracing
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _metrics_owns_tracing = True
+    _metrics_trace_memory = trace_memory
+    if not _metrics_enabled:
+        module = globals()
+        for name, function in _metrics_functions.items():
+            module[name] = _metered(name, function)
+        _metrics_enabled = True
+
+
+def disable_metrics():
+    """Restores the plain task functions and stops tracemalloc if enable_metrics started it."""
+    global _metrics_enabled, _metrics_trace_memory, _metrics_owns_tracing
+    globals().update(_metrics_functions)
+    _metrics_enabled = False
+    _metrics_trace_memory = False
+    if _metrics_owns_tracing:
+        tracemalloc.stop()
+        _metrics_owns_tracing = False
+
+
+def reset_metrics():
+    """Drops every collected metric."""
+    _metrics_registry.clear()
+
+
+@contextlib.contextmanager
+def collect_metrics(trace_memory: bool = False):
+    """Context manager that enables metrics for the duration of a with-block."""
+    enable_metrics(trace_memory)
+    try:
+        yield
+    finally:
+        disable_metrics()
+
+
+def _metered(name: str, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if name in _metrics_active:
+            return function(*args, **kwargs)
+        _metrics_active.add(name)
+        size = None
+        if args:
+            try:
+                size = len(args[0])
+            except TypeError:
+                pass
+        trace = _metrics_trace_memory and tracemalloc.is_tracing()
+        if trace:
+            current, peak = tracemalloc.get_traced_memory()
+            if _metrics_peak_frames:
+                _metrics_peak_frames[-1] = max(_metrics_peak_frames[-1], peak)
+            tracemalloc.reset_peak()
+            _metrics_peak_frames.append(0)
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - started
+            _metrics_active.discard(name)
+            peak_bytes = None
+            if trace:
+                peak = max(tracemalloc.get_traced_memory()[1], _metrics_peak_frames.pop())
+                if _metrics_peak_frames:
+                    _metrics_peak_frames[-1] = max(_metrics_peak_frames[-1], peak)
+                peak_bytes = max(peak - current, 0)
+            _record_call(name, seconds, size, peak_bytes)
+    return wrapper
+
+
+def _record_call(name: str, seconds: float, size, peak_bytes):
+    stats = _metrics_registry.setdefault(name, {"calls": 0, "total_seconds": 0.0, "samples": [],
+                                                "input_items": 0, "max_input": None, "peak_bytes": None})
+    stats["calls"] += 1
+    stats["total_seconds"] += seconds
+    samples = stats["samples"]
+    if len(samples) < _METRICS_SAMPLE_LIMIT:
+        samples.append(seconds)
+    else:
+        slot = random.randrange(stats["calls"])  # reservoir sampling over all calls
+        if slot < _METRICS_SAMPLE_LIMIT:
+            samples[slot] = seconds
+    if size is not None:
+        stats["input_items"] += size
+        stats["max_input"] = max(stats["max_input"] or 0, size)
+    if peak_bytes is not None:
+        stats["peak_bytes"] = max(stats["peak_bytes"] or 0, peak_bytes)
+
+
+def instrumented(function):
+    """Registers a module-level task function for metrics; it is only wrapped while metrics are enabled."""
+    _metrics_functions[function.__name__] = function
+    return function
+
+
+def metrics_snapshot() -> dict:
+    """
+    Returns the collected metrics per function.
+
+    Returns:
+        dict: name -> {'calls', 'total_seconds', 'mean_seconds', 'p50_seconds', 'p95_seconds',
+              'p99_seconds', 'max_seconds', 'input_items', 'max_input', 'peak_bytes'};
+              percentiles come from a uniform sample of at most 4096 calls.
+    """
+    snapshot = {}
+    for name, stats in _metrics_registry.items():
+        ordered = sorted(stats["samples"])
+        count = len(ordered)
+        snapshot[name] = {
+            "calls": stats["calls"],
+            "total_seconds": stats["total_seconds"],
+            "mean_seconds": stats["total_seconds"] / stats["calls"],
+            "p50_seconds": ordered[max(math.ceil(0.50 * count), 1) - 1],
+            "p95_seconds": ordered[max(math.ceil(0.95 * count), 1) - 1],
+            "p99_seconds": ordered[max(math.ceil(0.99 * count), 1) - 1],
+            "max_seconds": ordered[-1],
+            "input_items": stats["input_items"],
+            "max_input": stats["max_input"],
+            "peak_bytes": stats["peak_bytes"],
+        }
+    return snapshot
+
+
+def export_metrics(path: str = None) -> str:
+    """Serializes metrics_snapshot() as JSON, writing it to path when given; returns the JSON text."""
+    text = json.dumps(metrics_snapshot(), indent=2, sort_keys=True)
+    if path is not None:
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    return text
 
 
 # =======================================================
 # 🧩 TASK 1 — Extract Quantum Shards (Strings → List)
 # =======================================================
+@instrumented
 def extract_shards(corrupted_stream: str) -> list:
     """
     Splits a corrupted quantum stream where shards are separated by '#'.
@@ -65,9 +253,74 @@ def extract_shards(corrupted_stream: str) -> list:
     pass
 
 
+# -------------------------------------------------------
+# ⚙️ TASK 1 — Batched Shard Extraction (Many Streams → Process Pool)
+# -------------------------------------------------------
+class _ShardCleaningTable(dict):
+    """A str.translate() table keeping letters, digits, '-' and '_' and deleting the rest.
+
+    Characters are classified the first time they are seen (__missing__),
+    so the table covers all of Unicode while only storing the characters
+    that actually occur; ASCII is filled in up front.
+    """
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        value = codepoint if (char.isalnum() or char in "-_") else None
+        self[codepoint] = value
+        return value
+
+
+_SHARD_TABLE = _ShardCleaningTable()
+for _codepoint in range(128):
+    _SHARD_TABLE[_codepoint]
+del _codepoint
+
+
+def _clean_stream(stream: str) -> list:
+    """Splits one stream on '#', reverses each shard and cleans it in a single translate() pass."""
+    table = _SHARD_TABLE
+    return [shard[::-1].translate(table) for shard in stream.split("#")]
+
+
+@instrumented
+def extract_shards_batch(streams, workers: int = None, chunksize: int = 256,
+                         parallel_threshold: int = 4096) -> list:
+    """
+    Extracts and cleans the shards of many corrupted streams at once.
+
+    Each shard is cleaned by one str.translate() call over a precomputed
+    table instead of a per-character filter that builds intermediate lists.
+    Batches with at least parallel_threshold streams are fanned out over a
+    process pool in chunks of chunksize streams; smaller batches (or
+    workers=1) are processed inline, where pool start-up would cost more
+    than it saves. The result order always matches the input order.
+
+    Arguments:
+        streams (iterable): Raw corrupted shard strings.
+        workers (int): Number of worker processes (os.cpu_count() if None).
+        chunksize (int): Streams sent to a worker per task.
+        parallel_threshold (int): Minimum batch size that uses the process pool.
+
+    Returns:
+        list: One list of cleaned shard strings per input stream.
+
+    Example Input:
+        ["23noitazimitpO#gnirts_001#eman-tceles", "ahpla#ateb"]
+    Example Output:
+        [['Optimization32', '100_string', 'select-name'], ['alpha', 'beta']]
+    """
+    streams = streams if isinstance(streams, list) else list(streams)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(streams) < parallel_threshold:
+        return [_clean_stream(stream) for stream in streams]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_clean_stream, streams, chunksize=chunksize))
+
+
 # =======================================================
 # 🧩 TASK 2 — Pair Shards with Sequence Codes (List → Tuple)
 # =======================================================
+@instrumented
 def pair_shards(shards: list, codes: list) -> list:
     """
     Combines the decoded shard strings with their associated sequence codes
@@ -93,6 +346,7 @@ def pair_shards(shards: list, codes: list) -> list:
 # =======================================================
 # 🧩 TASK 3 — Stabilize Shard Registry (Sets)
 # =======================================================
+@instrumented
 def stabilize_registry(pairs: list) -> list:
     """
     Removes duplicate shard entries using a set and returns a list of
@@ -113,9 +367,109 @@ def stabilize_registry(pairs: list) -> list:
     pass
 
 
+# -------------------------------------------------------
+# ⚙️ TASK 3 — Columnar Keyed Shard Registry (Hash Index + Array)
+# -------------------------------------------------------
+class ShardRegistry:
+    """A columnar shard registry that pairs and deduplicates in one streaming pass.
+
+    Each distinct shard name gets one slot. Names are interned and kept in
+    a list, codes are stored in a parallel array('q'), and a dict maps every
+    name to its slot. There is one column entry per shard instead of one
+    (shard, code) tuple per record. When a name comes back, the conflict
+    policy decides which code stays in its slot:
+        'first'  keep the first code seen (stabilize_registry semantics)
+        'last'   keep the most recent code
+        'min'    keep the smallest code
+    Slots stay in first-seen order whatever the policy.
+
+    Attributes:
+        policy (str): The conflict policy.
+        names (list): Shard name of each slot.
+        codes (array): Sequence code of each slot.
+        index (dict): Shard name -> slot.
+    """
+    __slots__ = ("policy", "names", "codes", "index")
+
+    POLICIES = ("first", "last", "min")
+
+    def __init__(self, policy: str = "first"):
+        if policy not in self.POLICIES:
+            raise ValueError("policy must be one of %s" % ", ".join(self.POLICIES))
+        self.policy = policy
+        self.names = []
+        self.codes = array("q")
+        self.index = {}
+
+    @classmethod
+    def from_streams(cls, shards, codes, policy: str = "first") -> "ShardRegistry":
+        """
+        Pairs shards with codes (Task 2) and deduplicates them (Task 3) in one pass.
+
+        Arguments:
+            shards (iterable): Decoded shard strings.
+            codes (iterable): Integer sequence codes.
+            policy (str): Conflict policy for repeated shard names.
+
+        Returns:
+            ShardRegistry: The stabilized registry.
+
+        Example Input:
+            shards = ['alpha', 'beta', 'gamma', 'alpha'], codes = [7, 12, 18, 22]
+        Example Output:
+            registry.pairs() == [('alpha', 7), ('beta', 12), ('gamma', 18)]
+        """
+        registry = cls(policy)
+        registry.extend(zip(shards, codes))
+        return registry
+
+    def add(self, shard: str, code: int) -> bool:
+        """Registers one (shard, code) record; returns True if the shard name is new."""
+        slot = self.index.get(shard)
+        if slot is None:
+            self.index[shard] = len(self.names)
+            self.names.append(sys.intern(shard))
+            self.codes.append(code)
+            return True
+        if self.policy == "last" or (self.policy == "min" and code < self.codes[slot]):
+            self.codes[slot] = code
+        return False
+
+    def extend(self, pairs):
+        """Registers every (shard, code) record from an iterable."""
+        index, names, codes, intern = self.index, self.names, self.codes, sys.intern
+        policy = self.policy
+        for shard, code in pairs:
+            slot = index.get(shard)
+            if slot is None:
+                index[shard] = len(names)
+                names.append(intern(shard))
+                codes.append(code)
+            elif policy == "last" or (policy == "min" and code < codes[slot]):
+                codes[slot] = code
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, shard) -> bool:
+        return shard in self.index
+
+    def __getitem__(self, shard: str) -> int:
+        return self.codes[self.index[shard]]
+
+    def __iter__(self):
+        """Yields the stabilized (shard, code) tuples in first-seen order."""
+        return zip(self.names, self.codes)
+
+    def pairs(self) -> list:
+        """Returns the stabilized registry as the list of tuples stabilize_registry() returns."""
+        return list(self)
+
+
 # =======================================================
 # 🧩 TASK 4 — Initialize Reconstruction Queue (Queue)
 # =======================================================
+@instrumented
 def initialize_queue(unique_pairs: list) -> list:
     """
     Initializes a FIFO queue using deque and simulates shard processing.
@@ -136,9 +490,157 @@ def initialize_queue(unique_pairs: list) -> list:
     pass
 
 
+# -------------------------------------------------------
+# ⚙️ TASK 4 — Priority-Scheduled Reconstruction Queue (Heap)
+# -------------------------------------------------------
+class ReconstructionQueue:
+    """A reconstruction queue that hands out shards by priority.
+
+    Entries live in a binary heap (heapq) keyed by (priority, arrival), so
+    push and pop are O(log n) and shards with equal priority keep FIFO
+    order. Without a key function every shard's priority is its arrival
+    number, which makes the queue plain FIFO. Priorities are updated by
+    lazy deletion: the old heap entry is only marked dead and skipped when
+    it reaches the top.
+
+    Attributes:
+        key (callable): Maps a (shard, code) pair to its priority; smaller runs first.
+    """
+    _REMOVED = object()
+
+    def __init__(self, pairs=(), key=None):
+        self.key = key
+        self._heap = []
+        self._entries = {}  # code -> live heap entry
+        self._counter = itertools.count()
+        for pair in pairs:
+            self.push(pair)
+
+    def push(self, pair, priority=None):
+        """
+        Queues a (shard, code) pair, or re-prioritizes it if its code is already queued.
+
+        Arguments:
+            pair (tuple): The (shard, code) pair.
+            priority: Explicit priority; defaults to key(pair), or FIFO order without a key.
+        """
+        order = next(self._counter)
+        if priority is None:
+            priority = order if self.key is None else self.key(pair)
+        code = pair[1]
+        if code in self._entries:
+            self._entries.pop(code)[-1] = self._REMOVED
+        entry = [priority, order, pair]
+        self._entries[code] = entry
+        heapq.heappush(self._heap, entry)
+
+    def update(self, code: int, priority):
+        """Changes the priority of a queued shard; KeyError if the code is not queued."""
+        self.push(self._entries[code][-1], priority)
+
+    def remove(self, code: int):
+        """Drops a queued shard without processing it; KeyError if the code is not queued."""
+        self._entries.pop(code)[-1] = self._REMOVED
+
+    def pop(self):
+        """Removes and returns the (shard, code) pair with the smallest priority; IndexError if empty."""
+        heap = self._heap
+        while heap:
+            pair = heapq.heappop(heap)[-1]
+            if pair is not self._REMOVED:
+                del self._entries[pair[1]]
+                return pair
+        raise IndexError("pop from an empty reconstruction queue")
+
+    def pop_batch(self, size: int) -> list:
+        """Removes and returns up to size pairs in priority order; ValueError if size < 1."""
+        if size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        batch = []
+        while len(batch) < size and self._entries:
+            batch.append(self.pop())
+        return batch
+
+    def drain(self, batch_size: int = 1):
+        """Yields batches of up to batch_size pairs until the queue is empty; ValueError if batch_size < 1."""
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        while self._entries:
+            yield self.pop_batch(batch_size)
+
+    def __contains__(self, code) -> bool:
+        return code in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def energy_priority(shard_info: dict):
+    """Key function that schedules the highest-energy shards first (unknown shards last)."""
+    def key(pair):
+        info = shard_info.get(pair[1])
+        return -info["energy"] if info is not None else float("inf")
+    return key
+
+
+def dependency_priority(mapping: dict):
+    """Key function that schedules the most-depended-on shards first, by in-degree in the shard graph."""
+    in_degree = {}
+    for dependents in mapping.values():
+        for code in dependents:
+            in_degree[code] = in_degree.get(code, 0) + 1
+
+    def key(pair):
+        return -in_degree.get(str(pair[1]), 0)
+    return key
+
+
+@instrumented
+def schedule_reconstruction(unique_pairs, key=None, batch_size: int = None) -> list:
+    """
+    Processes shards FIFO (default, as initialize_queue) or by priority.
+
+    Every pair is scheduled, including pairs that repeat a code, and pairs
+    with equal priority keep their arrival order. The whole input is known
+    up front, so the priority order comes from one heapify plus O(log n)
+    pops; use ReconstructionQueue for code-keyed updates while shards
+    keep arriving.
+
+    Arguments:
+        unique_pairs (iterable): Unique (shard, code) tuples.
+        key (callable): Priority key over (shard, code) pairs; None keeps FIFO order.
+        batch_size (int): If given, return the processing order grouped into batches.
+
+    Returns:
+        list: Processed sequence codes, or lists of codes per batch when batch_size is set.
+
+    Raises:
+        ValueError: If batch_size is given but is not a positive integer.
+
+    Example Input:
+        [('alpha', 7), ('beta', 12), ('gamma', 18)], key=energy_priority({7: {"energy": 1.2},
+        12: {"energy": 4.0}, 18: {"energy": 2.5}})
+    Example Output:
+        [12, 18, 7]
+    """
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    if key is None:
+        codes = [code for _, code in unique_pairs]
+    else:
+        # (priority, arrival) entries: the arrival number breaks ties, so codes are never compared.
+        heap = [(key(pair), order, pair[1]) for order, pair in enumerate(unique_pairs)]
+        heapq.heapify(heap)
+        codes = [heapq.heappop(heap)[-1] for _ in range(len(heap))]
+    if batch_size is None:
+        return codes
+    return [codes[i:i + batch_size] for i in range(0, len(codes), batch_size)]
+
+
 # =======================================================
 # 🧩 TASK 5 — Action Log Stack (Stack)
 # =======================================================
+@instrumented
 def action_log(codes: list) -> list:
     """
     Builds an action log using a LIFO stack where each code generates
@@ -165,6 +667,7 @@ def action_log(codes: list) -> list:
 # =======================================================
 # 🧩 TASK 6 — Annotate Shards (Dictionary)
 # =======================================================
+@instrumented
 def annotate_shards(actions: list, shard_info: dict) -> dict:
     """
     Uses the action names (e.g., 'decode_7') to map each action
@@ -190,6 +693,7 @@ def annotate_shards(actions: list, shard_info: dict) -> dict:
 # =======================================================
 # 🧩 TASK 7 — Sort Shards by Energy (Sorting Algorithm)
 # =======================================================
+@instrumented
 def merge_sort_energy(shards: list) -> list:
     """
     Sorts a list of (code, energy) tuples by energy using merge sort.
@@ -209,6 +713,141 @@ def merge_sort_energy(shards: list) -> list:
     pass
 
 
+# -------------------------------------------------------
+# ⚙️ TASK 7 — Bottom-Up and External Merge Sort (Sorting Algorithm)
+# -------------------------------------------------------
+def _energy(shard):
+    """Default sort key: the energy of a (code, energy) pair."""
+    return shard[1]
+
+
+@instrumented
+def merge_sort_energy_bottom_up(shards, key=None) -> list:
+    """
+    Stable, iterative natural merge sort of (code, energy) pairs by energy.
+
+    The input is first cut into its natural ascending runs, which are then
+    merged pairwise, level by level, between the working list and a single
+    scratch buffer allocated once. Already-sorted input is one run and costs
+    a single O(n) scan; in general the cost is O(n log r) for r runs. Ties
+    are always taken from the left run, so equal energies keep their order.
+
+    Arguments:
+        shards (iterable): List of (code, energy) tuples.
+        key (callable): Sort key; defaults to the energy field.
+
+    Returns:
+        list: A new list sorted by ascending energy.
+
+    Example:
+        [(18, 3.1), (7, 1.2), (12, 2.5)]
+    Output:
+        [(7, 1.2), (12, 2.5), (18, 3.1)]
+    """
+    items = list(shards)
+    n = len(items)
+    keys = list(map(key or _energy, items))
+    bounds = [0]
+    bounds.extend(i for i in range(1, n) if keys[i] < keys[i - 1])
+    bounds.append(n)
+    if len(bounds) <= 2:
+        return items
+
+    src_keys, src_items = keys, items
+    dst_keys, dst_items = [None] * n, [None] * n
+    while len(bounds) > 2:
+        runs = len(bounds) - 1
+        merged = [0]
+        for r in range(0, runs, 2):
+            lo, mid = bounds[r], bounds[r + 1]
+            hi = bounds[r + 2] if r + 2 <= runs else mid
+            i, j, out = lo, mid, lo
+            while i < mid and j < hi:
+                if src_keys[j] < src_keys[i]:
+                    dst_keys[out], dst_items[out] = src_keys[j], src_items[j]
+                    j += 1
+                else:
+                    dst_keys[out], dst_items[out] = src_keys[i], src_items[i]
+                    i += 1
+                out += 1
+            # At most one of the two runs has a remainder; copy it in bulk.
+            dst_keys[out:out + mid - i] = src_keys[i:mid]
+            dst_items[out:out + mid - i] = src_items[i:mid]
+            out += mid - i
+            dst_keys[out:hi] = src_keys[j:hi]
+            dst_items[out:hi] = src_items[j:hi]
+            merged.append(hi)
+        bounds = merged
+        src_keys, dst_keys = dst_keys, src_keys
+        src_items, dst_items = dst_items, src_items
+    return src_items
+
+
+_ENERGY_RECORD = struct.Struct("<qd")  # (code: int64, energy: float64)
+
+
+def _write_run(run: list, path: str):
+    """Sorts one in-memory run and writes it as packed (code, energy) records."""
+    pack = _ENERGY_RECORD.pack
+    with open(path, "wb") as handle:
+        handle.write(b"".join(pack(code, energy) for code, energy in merge_sort_energy_bottom_up(run)))
+
+
+def _read_run(handle, records_per_read: int = 8192):
+    """Streams the (code, energy) records of a sorted run file."""
+    block = _ENERGY_RECORD.size * records_per_read
+    while True:
+        data = handle.read(block)
+        if not data:
+            return
+        yield from _ENERGY_RECORD.iter_unpack(data)
+
+
+def external_merge_sort_energy(records, run_size: int = 1 << 20, tmp_dir: str = None):
+    """
+    Sorts (code, energy) records that do not fit in memory, yielding them in energy order.
+
+    Records are read in runs of run_size, each run is sorted with
+    merge_sort_energy_bottom_up() and written to a temporary file as packed
+    (int64 code, float64 energy) records, and the runs are then k-way
+    merged with heapq.merge(). Both steps are stable and runs are merged in
+    input order, so equal energies keep their original order. Input that
+    fits in a single run never touches the disk.
+
+    Arguments:
+        records (iterable): (code, energy) tuples with integer codes.
+        run_size (int): Maximum number of records sorted in memory at once.
+        tmp_dir (str): Directory for the run files (system default if None).
+
+    Yields:
+        tuple: (code, energy) records in ascending energy order.
+    """
+    if run_size < 1:
+        raise ValueError("run_size must be a positive integer")
+    with tempfile.TemporaryDirectory(prefix="qv7-sort-", dir=tmp_dir) as workdir:
+        paths, run = [], []
+        for record in records:
+            run.append(record)
+            if len(run) >= run_size:
+                paths.append(os.path.join(workdir, "run-%d" % len(paths)))
+                _write_run(run, paths[-1])
+                run = []
+        if not paths:
+            yield from merge_sort_energy_bottom_up(run)
+            return
+        if run:
+            paths.append(os.path.join(workdir, "run-%d" % len(paths)))
+            _write_run(run, paths[-1])
+            run = []
+
+        handles = [open(path, "rb") for path in paths]
+        try:
+            yield from heapq.merge(*(_read_run(handle) for handle in handles), key=_energy)
+        finally:
+            for handle in handles:
+                handle.close()
+
+
 # =======================================================
 # 🧩 TASK 8 — Rebuild Quantum Integrity Tree (Binary Search Tree)
 # =======================================================
@@ -220,6 +859,7 @@ class QuantumNode:
         self.left = None
         self.right = None
 
+@instrumented
 def insert_qv(root: QuantumNode, code: int, energy: float) -> QuantumNode:
     """
     Inserts (code, energy) into a BST ordered by energy value.
@@ -233,6 +873,7 @@ def insert_qv(root: QuantumNode, code: int, energy: float) -> QuantumNode:
     pass
 
 
+@instrumented
 def inorder_qv(root: QuantumNode) -> list:
     """
     Performs an inorder traversal of the Quantum Vault BST.
@@ -252,9 +893,258 @@ def inorder_qv(root: QuantumNode) -> list:
     pass
 
 
+# -------------------------------------------------------
+# ⚙️ TASK 8 — Order-Statistics Quantum Tree (Balanced BST)
+# -------------------------------------------------------
+class QuantumStatsNode:
+    """A node of the order-statistics tree.
+
+    Has the same code/energy/left/right fields as QuantumNode, plus the
+    subtree height (for AVL balancing) and the subtree size (for rank and
+    k-th queries). The arrival number breaks ties between equal energies.
+    """
+    __slots__ = ("code", "energy", "left", "right", "height", "size", "arrival")
+
+    def __init__(self, code, energy, arrival):
+        self.code = code
+        self.energy = energy
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1
+        self.arrival = arrival
+
+
+def _qs_height(node) -> int:
+    return node.height if node is not None else 0
+
+
+def _qs_size(node) -> int:
+    return node.size if node is not None else 0
+
+
+def _qs_update(node):
+    node.height = 1 + max(_qs_height(node.left), _qs_height(node.right))
+    node.size = 1 + _qs_size(node.left) + _qs_size(node.right)
+
+
+def _qs_rotate_right(node):
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _qs_update(node)
+    _qs_update(pivot)
+    return pivot
+
+
+def _qs_rotate_left(node):
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _qs_update(node)
+    _qs_update(pivot)
+    return pivot
+
+
+def _qs_rebalance(node):
+    _qs_update(node)
+    balance = _qs_height(node.left) - _qs_height(node.right)
+    if balance > 1:
+        if _qs_height(node.left.left) < _qs_height(node.left.right):
+            node.left = _qs_rotate_left(node.left)
+        return _qs_rotate_right(node)
+    if balance < -1:
+        if _qs_height(node.right.right) < _qs_height(node.right.left):
+            node.right = _qs_rotate_right(node.right)
+        return _qs_rotate_left(node)
+    return node
+
+
+def _qs_insert(node, new):
+    # Recursion depth is bounded by the AVL height (about 1.44 * log2(n)).
+    if node is None:
+        return new
+    if (new.energy, new.arrival) < (node.energy, node.arrival):
+        node.left = _qs_insert(node.left, new)
+    else:
+        node.right = _qs_insert(node.right, new)
+    return _qs_rebalance(node)
+
+
+def _qs_delete(node, key):
+    if node is None:
+        return None
+    node_key = (node.energy, node.arrival)
+    if key < node_key:
+        node.left = _qs_delete(node.left, key)
+    elif node_key < key:
+        node.right = _qs_delete(node.right, key)
+    else:
+        if node.left is None:
+            return node.right
+        if node.right is None:
+            return node.left
+        successor = node.right
+        while successor.left is not None:
+            successor = successor.left
+        node.right = _qs_delete(node.right, (successor.energy, successor.arrival))
+        successor.left, successor.right = node.left, node.right
+        node = successor
+    return _qs_rebalance(node)
+
+
+class QuantumStatsTree:
+    """A balanced, size-augmented Quantum Vault tree ordered by energy.
+
+    Every node knows the size of its subtree, so order statistics take
+    O(log n) instead of a full inorder_qv() traversal: the k-th smallest
+    energy, the rank of an energy, range counts and percentiles. Insertion
+    and deletion keep the tree AVL-balanced. Equal energies keep their
+    insertion order, like insert_qv.
+
+    Attributes:
+        root (QuantumStatsNode): The root node, or None for an empty tree.
+    """
+    __slots__ = ("root", "_arrivals")
+
+    def __init__(self, pairs=None):
+        self.root = None
+        self._arrivals = itertools.count()
+        if pairs is not None:
+            for code, energy in pairs:
+                self.insert(code, energy)
+
+    @classmethod
+    def from_sorted(cls, pairs) -> "QuantumStatsTree":
+        """
+        Builds a perfectly balanced tree in O(n) from pairs already sorted by energy.
+
+        Arguments:
+            pairs (iterable): (code, energy) tuples in ascending energy order.
+
+        Returns:
+            QuantumStatsTree: The bulk-loaded tree; equal energies keep their given order.
+        """
+        pairs = pairs if isinstance(pairs, list) else list(pairs)
+        for i in range(1, len(pairs)):
+            if pairs[i][1] < pairs[i - 1][1]:
+                raise ValueError("pairs must be sorted by energy")
+
+        def build(lo: int, hi: int) -> QuantumStatsNode:
+            # Recursion depth is log2(n): the halves are balanced by construction.
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            code, energy = pairs[mid]
+            node = QuantumStatsNode(code, energy, mid)
+            node.left = build(lo, mid)
+            node.right = build(mid + 1, hi)
+            _qs_update(node)
+            return node
+
+        tree = cls()
+        tree.root = build(0, len(pairs))
+        tree._arrivals = itertools.count(len(pairs))
+        return tree
+
+    def __len__(self) -> int:
+        return _qs_size(self.root)
+
+    def insert(self, code: int, energy: float):
+        """Inserts (code, energy) in O(log n)."""
+        self.root = _qs_insert(self.root, QuantumStatsNode(code, energy, next(self._arrivals)))
+
+    def delete(self, code: int, energy: float) -> bool:
+        """
+        Removes the earliest inserted shard with this code and energy.
+
+        Returns:
+            bool: True if a shard was removed, False if none matched.
+        """
+        for node in self._iter_nodes(energy):
+            if node.energy != energy:
+                break
+            if node.code == code:
+                self.root = _qs_delete(self.root, (node.energy, node.arrival))
+                return True
+        return False
+
+    def kth_smallest(self, k: int) -> tuple:
+        """Returns the (code, energy) pair at 0-based position k in energy order."""
+        if not 0 <= k < len(self):
+            raise IndexError("k out of range")
+        node = self.root
+        while True:
+            left = _qs_size(node.left)
+            if k < left:
+                node = node.left
+            elif k == left:
+                return (node.code, node.energy)
+            else:
+                k -= left + 1
+                node = node.right
+
+    def rank(self, energy: float) -> int:
+        """Returns how many shards have an energy strictly below energy."""
+        count, node = 0, self.root
+        while node is not None:
+            if node.energy < energy:
+                count += _qs_size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def _rank_at_most(self, energy: float) -> int:
+        count, node = 0, self.root
+        while node is not None:
+            if node.energy <= energy:
+                count += _qs_size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def count_range(self, low: float, high: float) -> int:
+        """Returns how many shards have low <= energy <= high."""
+        if high < low:
+            return 0
+        return self._rank_at_most(high) - self.rank(low)
+
+    def percentile(self, p: float) -> tuple:
+        """Returns the (code, energy) pair at the p-th percentile (nearest-rank method, 0 < p <= 100)."""
+        if not 0 < p <= 100:
+            raise ValueError("p must be in (0, 100]")
+        return self.kth_smallest(max(math.ceil(p / 100 * len(self)), 1) - 1)
+
+    def _iter_nodes(self, start: float = None):
+        stack, node = [], self.root
+        while stack or node is not None:
+            if node is not None:
+                if start is not None and node.energy < start:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+                continue
+            node = stack.pop()
+            yield node
+            node = node.right
+
+    def __iter__(self):
+        """Yields (code, energy) pairs in ascending energy order, like inorder_qv."""
+        for node in self._iter_nodes():
+            yield (node.code, node.energy)
+
+    def inorder(self) -> list:
+        """Returns the inorder traversal as a list, like inorder_qv."""
+        return list(self)
+
+
 # =======================================================
 # 🧩 TASK 9 — Build Shard Dependency Map (Graph)
 # =======================================================
+@instrumented
 def build_shard_graph(mapping: dict) -> dict:
     """
     Builds an adjacency list representing quantum shard dependencies.
@@ -276,9 +1166,208 @@ def build_shard_graph(mapping: dict) -> dict:
     pass
 
 
+# -------------------------------------------------------
+# ⚙️ TASK 9 — Interned CSR Shard Graph and Streaming JSON Loader
+# -------------------------------------------------------
+class ShardCSRGraph(Mapping):
+    """A read-only shard dependency graph in compressed-sparse-row form.
+
+    Shard codes are interned to dense integers 0..n-1 and the edges live in
+    two array('q') buffers: the dependents of shard i are
+    targets[offsets[i]:offsets[i + 1]], in their original order. It still
+    reads like the adjacency list from build_shard_graph (graph[code] gives
+    the list of dependent codes), so dict-based DFS code can consume it.
+    Shards that only appear as dependents are included with no edges.
+
+    Attributes:
+        codes (list): Shard code of each dense index.
+        index (dict): Shard code -> dense index.
+        offsets (array): n + 1 edge offsets into targets.
+        targets (array): Dense indices of the dependent shards.
+    """
+    __slots__ = ("codes", "index", "offsets", "targets")
+
+    def __init__(self, codes: list, offsets: array, targets: array):
+        self.codes = codes
+        self.index = {code: position for position, code in enumerate(codes)}
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_edges(cls, codes: list, sources, targets) -> "ShardCSRGraph":
+        """
+        Builds the CSR arrays from parallel edge lists with a stable counting sort.
+
+        Arguments:
+            codes (list): Shard code of each dense index.
+            sources (iterable): Dense source index of every edge.
+            targets (iterable): Dense target index of every edge.
+
+        Returns:
+            ShardCSRGraph: The graph; each shard's dependents keep their edge order.
+        """
+        n = len(codes)
+        offsets = array("q", bytes(8 * (n + 1)))
+        for source in sources:
+            offsets[source + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        packed = array("q", bytes(8 * offsets[n]))
+        cursor = offsets.tolist()
+        for source, target in zip(sources, targets):
+            packed[cursor[source]] = target
+            cursor[source] += 1
+        return cls(codes, offsets, packed)
+
+    @classmethod
+    def from_mapping(cls, mapping: dict) -> "ShardCSRGraph":
+        """Builds the graph from an adjacency dict such as build_shard_graph() returns."""
+        codes, index = [], {}
+        sources, targets = array("q"), array("q")
+
+        def intern(code) -> int:
+            position = index.get(code)
+            if position is None:
+                position = index[code] = len(codes)
+                codes.append(code)
+            return position
+
+        for code in mapping:
+            intern(code)
+        for code, dependents in mapping.items():
+            source = index[code]
+            for dependent in dependents:
+                sources.append(source)
+                targets.append(intern(dependent))
+        return cls.from_edges(codes, sources, targets)
+
+    def __getitem__(self, code) -> list:
+        position = self.index[code]
+        codes = self.codes
+        return [codes[t] for t in self.targets[self.offsets[position]:self.offsets[position + 1]]]
+
+    def __contains__(self, code) -> bool:
+        return code in self.index
+
+    def __iter__(self):
+        return iter(self.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def edge_count(self) -> int:
+        """Total number of dependency edges."""
+        return len(self.targets)
+
+    def successors(self, position: int) -> array:
+        """Returns the dense indices of the dependents of dense index position."""
+        return self.targets[self.offsets[position]:self.offsets[position + 1]]
+
+
+_JSON_WHITESPACE = re.compile(r"\s*")
+
+
+def _iter_json_values(handle, chunk_size: int):
+    """
+    Yields consecutive top-level JSON values from a text stream (JSONL or
+    concatenated objects), decoding each with JSONDecoder.raw_decode() over
+    a sliding buffer so the whole file is never held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+    read_size = chunk_size
+    while True:
+        position = _JSON_WHITESPACE.match(buffer, position).end()
+        if position < len(buffer):
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # The value continues past the buffer: read more (growing the
+                # read size so one huge value is not re-parsed too often).
+                read_size = max(read_size, len(buffer) - position)
+            else:
+                yield value
+                position = end
+                read_size = chunk_size
+                continue
+        elif eof:
+            return
+        chunk = handle.read(read_size)
+        if not chunk:
+            eof = True
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+@instrumented
+def load_shard_graph(source, chunk_size: int = 1 << 20) -> ShardCSRGraph:
+    """
+    Loads a large shard dependency map straight into a ShardCSRGraph.
+
+    The input is parsed incrementally, one top-level JSON value at a time,
+    so the fully parsed dict that json.load() would build is never created.
+    Each value is either an object mapping shard codes to dependent codes
+    (one or more entries per line) or a [code, [dependents...]] pair. Codes
+    are interned to dense ints as they appear, and edges are collected in
+    two flat array('q') buffers that become the CSR arrays.
+
+    Arguments:
+        source: A path, or a text file object, containing JSONL / concatenated JSON values.
+        chunk_size (int): Number of characters read per chunk.
+
+    Returns:
+        ShardCSRGraph: The dependency graph with shard codes as strings.
+
+    Raises:
+        ValueError: If the input is not valid JSON, or a value or an entry's dependents are not in the shapes above.
+
+    Example Input (file contents):
+        {"7": ["12"]}
+        {"12": ["18"]}
+        ["18", []]
+    Example Output:
+        ShardCSRGraph equal to {"7": ["12"], "12": ["18"], "18": []}
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as handle:
+            return load_shard_graph(handle, chunk_size)
+
+    codes, index = [], {}
+    sources, targets = array("q"), array("q")
+
+    def intern(code) -> int:
+        code = str(code)
+        position = index.get(code)
+        if position is None:
+            position = index[code] = len(codes)
+            codes.append(code)
+        return position
+
+    for value in _iter_json_values(source, chunk_size):
+        if isinstance(value, dict):
+            entries = value.items()
+        elif isinstance(value, list) and len(value) == 2:
+            entries = (value,)
+        else:
+            raise ValueError("expected an object or a [code, [dependents]] pair, got %r" % (value,))
+        for code, dependents in entries:
+            if not isinstance(dependents, list):
+                raise ValueError("expected a list of dependents for shard %r, got %r" % (code, dependents))
+            node = intern(code)
+            for dependent in dependents:
+                sources.append(node)
+                targets.append(intern(dependent))
+
+    return ShardCSRGraph.from_edges(codes, sources, targets)
+
+
 # =======================================================
 # 🧩 TASK 10 — Activate Vault Sequence (DFS Traversal)
 # =======================================================
+@instrumented
 def dfs_sequence(graph: dict, start: str) -> list:
     """
     Performs DFS to determine the activation order of quantum shards.
@@ -299,4 +1388,553 @@ def dfs_sequence(graph: dict, start: str) -> list:
         "Quantum Vault fully restored. Protocol QV-7 complete."
     """
     # TODO: Implement DFS recursively
-    pass
\ No newline at end of file
+    pass
+
+
+# -------------------------------------------------------
+# ⚙️ TASK 10 — Incremental Shard Graph with Cached Activation Orders
+# -------------------------------------------------------
+_VAULT_MESSAGE = "Quantum Vault fully restored. Protocol QV-7 complete."
+
+
+def _dfs_preorder(neighbors, start) -> list:
+    """Iterative DFS preorder from start; identical to the recursive traversal."""
+    order, visited = [start], {start}
+    stack = [iter(neighbors(start))]
+    while stack:
+        for node in stack[-1]:
+            if node not in visited:
+                visited.add(node)
+                order.append(node)
+                stack.append(iter(neighbors(node)))
+                break
+        else:
+            stack.pop()
+    return order
+
+
+class ShardGraph:
+    """A mutable shard dependency graph that caches activation orders.
+
+    The DFS order from each start shard is computed once and cached. The
+    graph also remembers which cached starts reached each shard. Editing the
+    out-edges of shard u can only change orders whose traversal expanded u,
+    so add_edge/remove_edge drop exactly those cache entries and keep all
+    others. Between edits, a repeated query is a dictionary lookup.
+    """
+    def __init__(self, mapping: dict = None):
+        self._adjacency = {code: list(dependents) for code, dependents in (mapping or {}).items()}
+        self._orders = {}    # start -> cached activation order (tuple)
+        self._reached = {}   # shard -> set of cached starts whose order contains it
+
+    def add_edge(self, source: str, target: str):
+        """Adds the dependency source -> target (after source's existing dependents)."""
+        self._adjacency.setdefault(source, []).append(target)
+        self._invalidate(source)
+
+    def remove_edge(self, source: str, target: str):
+        """Removes one source -> target dependency; ValueError if it does not exist."""
+        dependents = self._adjacency.get(source)
+        if not dependents or target not in dependents:
+            raise ValueError("no edge %r -> %r" % (source, target))
+        dependents.remove(target)
+        self._invalidate(source)
+
+    def _invalidate(self, shard):
+        for start in self._reached.pop(shard, ()):
+            for reached in self._orders.pop(start):
+                starts = self._reached.get(reached)
+                if starts is not None:
+                    starts.discard(start)
+                    if not starts:
+                        del self._reached[reached]
+
+    def activation_order(self, start: str) -> tuple:
+        """
+        Returns the DFS activation order from start, served from the cache when possible.
+
+        Arguments:
+            start (str): Starting shard code.
+
+        Returns:
+            tuple: Activation order of shard codes.
+        """
+        order = self._orders.get(start)
+        if order is None:
+            get = self._adjacency.get
+            order = self._orders[start] = tuple(_dfs_preorder(lambda shard: get(shard, ()), start))
+            for shard in order:
+                self._reached.setdefault(shard, set()).add(start)
+        return order
+
+    def dfs_sequence(self, start: str) -> tuple:
+        """
+        Cached counterpart of dfs_sequence(graph, start).
+
+        Returns:
+            list: Activation order of shard codes.
+            str: Completion message.
+        """
+        return list(self.activation_order(start)), _VAULT_MESSAGE
+
+    def is_cached(self, start: str) -> bool:
+        """Tells whether the activation order from start is currently cached."""
+        return start in self._orders
+
+    def to_mapping(self) -> dict:
+        """Returns a copy of the adjacency list."""
+        return {code: list(dependents) for code, dependents in self._adjacency.items()}
+
+# -------------------------------------------------------
+# ⚙️ TASK 10 — Weighted Activation Planning (Dijkstra)
+# -------------------------------------------------------
+def shard_energy_costs(annotations: dict) -> dict:
+    """
+    Turns annotate_shards() output into per-shard activation costs.
+
+    Arguments:
+        annotations (dict): Mapping from action name ('decode_7') to shard metadata.
+
+    Returns:
+        dict: Shard code (as a graph key string) -> energy.
+
+    Example Input:
+        {'decode_7': {'energy': 1.2, 'state': 'stable'}}
+    Example Output:
+        {'7': 1.2}
+    """
+    return {action.rpartition("_")[2]: info["energy"] for action, info in annotations.items()}
+
+
+@instrumented
+def plan_activation(graph, start: str, costs: dict, target: str = None, default_cost: float = None) -> tuple:
+    """
+    Computes the cheapest activation paths from start with Dijkstra's algorithm.
+
+    Activating a shard costs its energy, and a path costs the sum of the
+    energies of all shards on it, start included. The frontier is a heapq
+    priority queue with lazy deletion: outdated entries are skipped when
+    they are popped. The run is O((V + E) log V). On a ShardCSRGraph it
+    walks the integer arrays directly. With a target, the search stops as
+    soon as the target is settled.
+
+    Arguments:
+        graph (dict): Adjacency list from build_shard_graph (or a ShardCSRGraph).
+        start (str): Starting shard code.
+        costs (dict): Shard code -> non-negative energy (see shard_energy_costs).
+        target (str): Optional shard code at which to stop early.
+        default_cost (float): Cost of shards missing from costs (KeyError if None).
+
+    Returns:
+        dict: Settled shard code -> minimal total activation cost.
+        dict: Settled shard code -> previous shard on its cheapest path (None for start).
+
+    Example:
+        graph = {"7": ["12", "18"], "12": ["18"], "18": []}
+        costs = {"7": 1.2, "12": 2.5, "18": 3.1}
+    Output:
+        {'7': 1.2, '12': 3.7, '18': 4.3}, {'7': None, '12': '7', '18': '7'}
+    """
+    def lookup(code) -> float:
+        cost = costs.get(code, default_cost)
+        if cost is None:
+            raise KeyError("no activation cost for shard %r" % (code,))
+        if cost < 0:
+            raise ValueError("negative activation cost for shard %r" % (code,))
+        return cost
+
+    if isinstance(graph, ShardCSRGraph):
+        neighbors, label = graph.successors, graph.codes.__getitem__
+        node_costs = {}  # dense index -> cost, filled as nodes are relaxed
+
+        def cost_of(position: int) -> float:
+            cost = node_costs.get(position)
+            if cost is None:
+                cost = node_costs[position] = lookup(label(position))
+            return cost
+
+        source = graph.index.get(start)
+        if source is None:  # like a dict: a shard with no entry activates only itself
+            return {start: lookup(start)}, {start: None}
+        goal = graph.index.get(target) if target is not None else None
+    else:
+        get = graph.get
+        neighbors, label, cost_of = (lambda code: get(code, ())), None, lookup
+        source, goal = start, target
+
+    best = {source: cost_of(source)}
+    parent = {source: None}
+    settled, settled_parent = {}, {}
+    heap = [(best[source], source)]
+    while heap:
+        cost, node = heapq.heappop(heap)
+        if node in settled or cost > best[node]:
+            continue
+        settled[node] = cost
+        settled_parent[node] = parent[node]
+        if node == goal:
+            break
+        for nxt in neighbors(node):
+            if nxt in settled:
+                continue
+            candidate = cost + cost_of(nxt)
+            if candidate < best.get(nxt, float("inf")):
+                best[nxt] = candidate
+                parent[nxt] = node
+                heapq.heappush(heap, (candidate, nxt))
+
+    if label is None:
+        return settled, settled_parent
+    return ({label(node): cost for node, cost in settled.items()},
+            {label(node): (None if prev is None else label(prev)) for node, prev in settled_parent.items()})
+
+
+def activation_path(parents: dict, target: str) -> list:
+    """Rebuilds the cheapest start -> target path from plan_activation() parents ([] if unreachable)."""
+    if target not in parents:
+        return []
+    path = [target]
+    while parents[path[-1]] is not None:
+        path.append(parents[path[-1]])
+    path.reverse()
+    return path
+
+
+# -------------------------------------------------------
+# ⚙️ TASK 10 — Parallel Multi-Source Activation (Shared Memory)
+# -------------------------------------------------------
+_activation_graph = None  # per worker: (SharedMemory, offsets view, targets view)
+
+
+def _attach_activation_graph(name: str, n: int, m: int):
+    """Pool initializer: maps the shared CSR block once per worker process."""
+    global _activation_graph
+    if sys.version_info >= (3, 13):
+        block = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        # Pool workers share the parent's resource tracker, so this duplicate
+        # registration is dropped again when the parent unlinks the block.
+        block = shared_memory.SharedMemory(name=name)
+    words = block.buf.cast("q")
+    _activation_graph = (block, words[:n + 1], words[n + 1:n + 1 + m])
+
+
+def _csr_preorder(offsets, targets, start: int) -> list:
+    """DFS preorder over dense CSR indices; same order as _dfs_preorder, without per-node slices."""
+    seen = bytearray(len(offsets) - 1)
+    seen[start] = 1
+    order = [start]
+    cursors, ends = [offsets[start]], [offsets[start + 1]]
+    while cursors:
+        i, end = cursors[-1], ends[-1]
+        while i < end:
+            node = targets[i]
+            i += 1
+            if not seen[node]:
+                break
+        else:
+            cursors.pop()
+            ends.pop()
+            continue
+        cursors[-1] = i
+        seen[node] = 1
+        order.append(node)
+        cursors.append(offsets[node])
+        ends.append(offsets[node + 1])
+    return order
+
+
+def _activate_position(position: int) -> array:
+    _, offsets, targets = _activation_graph
+    return array("q", _csr_preorder(offsets, targets, position))
+
+
+class ActivationPool:
+    """Runs many DFS activations over one graph in a pool of worker processes.
+
+    The graph is converted to CSR form once and its offsets/targets are
+    copied into a single multiprocessing.shared_memory block of int64
+    words. Each worker maps that block when it starts, so a batch only
+    sends start indices to the workers and receives packed activation
+    orders back; the graph itself is never pickled. The pool and the
+    block live until close() (or the end of a with-block), so repeated
+    batches on the same graph pay the start-up cost once.
+
+    Batches smaller than parallel_threshold, or workers=1, run inline on
+    the CSR arrays, where pool start-up would cost more than it saves.
+
+    Attributes:
+        graph (ShardCSRGraph): The graph the activations run on.
+    """
+    def __init__(self, graph, workers: int = None, chunksize: int = 64, parallel_threshold: int = 256):
+        self.graph = graph if isinstance(graph, ShardCSRGraph) else ShardCSRGraph.from_mapping(graph)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.parallel_threshold = parallel_threshold
+        self._block = None
+        self._pool = None
+
+    def _start(self):
+        n, m = len(self.graph), self.graph.edge_count
+        block = shared_memory.SharedMemory(create=True, size=8 * (n + 1 + m))
+        try:
+            words = block.buf.cast("q")
+            words[:n + 1] = self.graph.offsets
+            words[n + 1:n + 1 + m] = self.graph.targets
+            words.release()
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_attach_activation_graph,
+                                             initargs=(block.name, n, m))
+        except BaseException:
+            block.close()
+            block.unlink()
+            raise
+        self._block = block
+
+    def activate(self, starts) -> list:
+        """
+        Computes the DFS activation order from every start shard.
+
+        Arguments:
+            starts (iterable): Starting shard codes (codes missing from the graph activate only themselves).
+
+        Returns:
+            list: One activation order (list of shard codes) per start, in input order.
+
+        Example:
+            ActivationPool({"7": ["12"], "12": ["18"], "18": []}).activate(["7", "12"])
+        Output:
+            [['7', '12', '18'], ['12', '18']]
+        """
+        graph = self.graph
+        starts = starts if isinstance(starts, list) else list(starts)
+        index = graph.index
+        positions = [index.get(start, -1) for start in starts]
+        known = [position for position in positions if position >= 0]
+        if self.workers == 1 or len(known) < self.parallel_threshold:
+            orders = iter([_csr_preorder(graph.offsets, graph.targets, position) for position in known])
+        else:
+            if self._pool is None:
+                self._start()
+            orders = self._pool.map(_activate_position, known, chunksize=self.chunksize)
+        codes = graph.codes
+        return [list(map(codes.__getitem__, next(orders))) if position >= 0 else [start]
+                for start, position in zip(starts, positions)]
+
+    def close(self):
+        """Shuts the worker pool down and releases the shared-memory block."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._block is not None:
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+@instrumented
+def dfs_sequence_batch(graph, starts, workers: int = None, chunksize: int = 64,
+                       parallel_threshold: int = 256) -> list:
+    """
+    Multi-source counterpart of dfs_sequence(graph, start) over a shared-memory graph.
+
+    Arguments:
+        graph (dict | ShardCSRGraph): Adjacency list from build_shard_graph, or its CSR form.
+        starts (iterable): Starting shard codes.
+        workers (int): Number of worker processes (os.cpu_count() if None).
+        chunksize (int): Starts sent to a worker per task.
+        parallel_threshold (int): Minimum number of starts that uses the process pool.
+
+    Returns:
+        list: One activation order per start, in input order.
+
+    Example:
+        graph = {"7": ["12", "18"], "12": ["22"], "18": [], "22": []}
+        starts = ["7", "18", "12"]
+    Output:
+        [['7', '12', '22', '18'], ['18'], ['12', '22']]
+    """
+    with ActivationPool(graph, workers, chunksize, parallel_threshold) as pool:
+        return pool.activate(starts)
+
+
+# =======================================================
+# 💾 SNAPSHOTS — Versioned Binary Warm Start (Trees & Graphs)
+# =======================================================
+# Layout (little-endian): a 48-byte header, then fixed-width 8-byte columns.
+#   tree  (kind 1): codes int64[n], energies float64[n]        (inorder)
+#   graph (kind 2): offsets int64[n + 1], targets int64[m], codes utf-8 (NUL-joined)
+# The header carries the payload CRC-32 and ends with its own CRC-32.
+_SNAPSHOT_MAGIC = b"QV7SNAPS"
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_TREE = 1
+_SNAPSHOT_GRAPH = 2
+_SNAPSHOT_HEADER = struct.Struct("<8sHHIQQQI")  # magic, version, kind, reserved, n, m, names bytes, payload crc
+_SNAPSHOT_HEADER_CRC = struct.Struct("<I")
+_SNAPSHOT_HEADER_SIZE = _SNAPSHOT_HEADER.size + _SNAPSHOT_HEADER_CRC.size
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is truncated, corrupted, or of an unknown version or kind."""
+
+
+def _little_endian(values: array) -> array:
+    """Returns values in on-disk byte order (a byteswapped copy on big-endian hosts)."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _read_words(view, offset: int, count: int, typecode: str) -> array:
+    """Copies count 8-byte words at offset into an array of typecode with one memcpy."""
+    words = array(typecode)
+    words.frombytes(view[offset:offset + 8 * count])
+    if sys.byteorder == "big":
+        words.byteswap()
+    return words
+
+
+def _write_snapshot(path: str, kind: int, n: int, m: int, parts: list, names_size: int = 0):
+    payload_crc = 0
+    for part in parts:
+        payload_crc = zlib.crc32(part, payload_crc)
+    header = _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, kind, 0, n, m, names_size, payload_crc)
+    # A crashed save leaves the previous snapshot in place: os.replace is atomic.
+    descriptor, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as handle:
+            handle.write(header)
+            handle.write(_SNAPSHOT_HEADER_CRC.pack(zlib.crc32(header)))
+            for part in parts:
+                handle.write(part)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _check_snapshot(view, path: str, kind: int) -> tuple:
+    """Validates a mapped snapshot's header and checksums; returns (n, m, names_size)."""
+    with view[:_SNAPSHOT_HEADER.size] as header:
+        magic, version, found_kind, _, n, m, names_size, payload_crc = _SNAPSHOT_HEADER.unpack(header)
+        if magic != _SNAPSHOT_MAGIC:
+            raise SnapshotError("%s: not a Protocol QV-7 snapshot" % path)
+        if _SNAPSHOT_HEADER_CRC.unpack_from(view, _SNAPSHOT_HEADER.size)[0] != zlib.crc32(header):
+            raise SnapshotError("%s: header checksum mismatch" % path)
+    if version != _SNAPSHOT_VERSION:
+        raise SnapshotError("%s: unsupported snapshot version %d" % (path, version))
+    if found_kind != kind:
+        raise SnapshotError("%s: snapshot holds kind %d, expected %d" % (path, found_kind, kind))
+    expected = 16 * n if kind == _SNAPSHOT_TREE else 8 * (n + 1 + m) + names_size
+    with view[_SNAPSHOT_HEADER_SIZE:] as payload:
+        if len(payload) != expected:
+            raise SnapshotError("%s: payload is %d bytes, expected %d" % (path, len(payload), expected))
+        if zlib.crc32(payload) != payload_crc:
+            raise SnapshotError("%s: payload checksum mismatch" % path)
+    return n, m, names_size
+
+
+@contextlib.contextmanager
+def _mapped_snapshot(path: str, kind: int):
+    """Memory-maps and validates a snapshot; yields (view, n, m, names_size)."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size < _SNAPSHOT_HEADER_SIZE:
+            raise SnapshotError("%s: truncated snapshot header" % path)
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield (view,) + _check_snapshot(view, path, kind)
+            finally:
+                view.release()
+
+
+def save_tree_snapshot(tree, path: str):
+    """
+    Writes a Quantum Vault tree to a binary snapshot file.
+
+    Arguments:
+        tree (QuantumStatsTree | QuantumNode): The tree, or the root node of a BST built by insert_qv.
+        path (str): Destination file (replaced atomically).
+    """
+    codes, energies = array("q"), array("d")
+    if isinstance(tree, QuantumStatsTree):
+        for code, energy in tree:
+            codes.append(code)
+            energies.append(energy)
+    else:
+        stack, node = [], tree
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node.left
+                continue
+            node = stack.pop()
+            codes.append(node.code)
+            energies.append(node.energy)
+            node = node.right
+    _write_snapshot(path, _SNAPSHOT_TREE, len(codes), 0, [_little_endian(codes), _little_endian(energies)])
+
+
+def load_tree_snapshot(path: str) -> QuantumStatsTree:
+    """
+    Loads a tree snapshot into a balanced QuantumStatsTree in O(n).
+
+    The file is memory-mapped and its columns are copied out in bulk; the
+    tree is then bulk-loaded from the stored inorder sequence, so there is
+    no per-record parsing or rebalancing. Equal energies keep their saved
+    order.
+
+    Arguments:
+        path (str): Snapshot file written by save_tree_snapshot().
+
+    Returns:
+        QuantumStatsTree: A tree with the same inorder (code, energy) pairs.
+    """
+    with _mapped_snapshot(path, _SNAPSHOT_TREE) as (view, n, _, _):
+        codes = _read_words(view, _SNAPSHOT_HEADER_SIZE, n, "q")
+        energies = _read_words(view, _SNAPSHOT_HEADER_SIZE + 8 * n, n, "d")
+    return QuantumStatsTree.from_sorted(list(zip(codes.tolist(), energies.tolist())))
+
+
+def save_graph_snapshot(graph, path: str):
+    """
+    Writes a shard dependency graph to a binary snapshot file in CSR form.
+
+    Arguments:
+        graph (dict | ShardCSRGraph): Adjacency list from build_shard_graph, or its CSR form.
+        path (str): Destination file (replaced atomically).
+
+    Raises:
+        ValueError: If a shard code is not a str or contains a NUL character.
+    """
+    graph = graph if isinstance(graph, ShardCSRGraph) else ShardCSRGraph.from_mapping(graph)
+    for code in graph.codes:
+        if not isinstance(code, str) or "\0" in code:
+            raise ValueError("graph snapshots need str shard codes without NUL characters, got %r" % (code,))
+    names = "\0".join(graph.codes).encode("utf-8")
+    parts = [_little_endian(graph.offsets), _little_endian(graph.targets), names]
+    _write_snapshot(path, _SNAPSHOT_GRAPH, len(graph), graph.edge_count, parts, len(names))
+
+
+def load_graph_snapshot(path: str) -> ShardCSRGraph:
+    """
+    Loads a graph snapshot into a ShardCSRGraph in O(n + m).
+
+    Arguments:
+        path (str): Snapshot file written by save_graph_snapshot().
+
+    Returns:
+        ShardCSRGraph: The graph, with the same codes and dependent order as the saved one.
+    """
+    with _mapped_snapshot(path, _SNAPSHOT_GRAPH) as (view, n, m, _):
+        offset = _SNAPSHOT_HEADER_SIZE
+        offsets = _read_words(view, offset, n + 1, "q")
+        targets = _read_words(view, offset + 8 * (n + 1), m, "q")
+        names = str(view[offset + 8 * (n + 1 + m):], "utf-8")
+    return ShardCSRGraph(names.split("\0") if n else [], offsets, targets)
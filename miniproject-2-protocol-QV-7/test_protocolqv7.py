@@ -0,0 +1,443 @@
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+import bench_protocolqv7
+import protocol_qv7
+from bench_protocolqv7 import (make_streams, make_energies, make_graph, oracle_extract_shards,
+                               oracle_sort_energy, oracle_dfs)
+from protocol_qv7 import (extract_shards, merge_sort_energy, insert_qv, inorder_qv, dfs_sequence, QuantumNode)
+from protocol_qv7 import (extract_shards_batch, ReconstructionQueue, schedule_reconstruction,
+                          energy_priority, dependency_priority,
+                          merge_sort_energy_bottom_up, external_merge_sort_energy,
+                          QuantumStatsTree, ShardGraph, ShardCSRGraph, load_shard_graph,
+                          shard_energy_costs, plan_activation, activation_path,
+                          ShardRegistry, ActivationPool, dfs_sequence_batch, enable_metrics, disable_metrics, reset_metrics,
+                          collect_metrics, metrics_snapshot, export_metrics, save_tree_snapshot,
+                          load_tree_snapshot, save_graph_snapshot, load_graph_snapshot, SnapshotError)
+
+
+class TestProtocolQV7Engines(unittest.TestCase):
+    """Unit tests for the scalable engines that accompany the Protocol QV-7 tasks.
+
+    Methods:
+        test_task1_extract_shards_batch: Tests inline batch extraction and cleaning.
+        test_task1_extract_shards_batch_pool: Tests process-pool fan-out keeps input order.
+        test_task3_shard_registry: Tests one-pass pairing and dedup under each conflict policy.
+        test_task4_schedule_reconstruction: Tests FIFO and priority modes keep repeated codes and reject bad batches.
+        test_task4_reconstruction_queue_updates: Tests lazy-deletion updates, removal and batch validation.
+        test_task7_merge_sort_bottom_up: Tests stable natural merge sort on several input shapes.
+        test_task7_external_merge_sort: Tests the run-file + k-way merge mode is stable.
+        test_task8_quantum_stats_tree: Tests k-th, rank, range count and percentile queries.
+        test_task8_quantum_stats_tree_delete: Tests deletion against a sorted-list oracle.
+        test_task8_tree_snapshot: Tests bulk loading and the binary tree snapshot round trip.
+        test_task9_shard_csr_graph: Tests CSR construction and dict-compatible lookups.
+        test_task9_load_shard_graph: Tests incremental JSONL loading across chunk boundaries.
+        test_task9_graph_snapshot: Tests the binary CSR graph snapshot round trip and checksums.
+        test_task10_shard_graph_cache: Tests cached orders and targeted invalidation on edits.
+        test_task10_plan_activation: Tests minimum-cost paths, early exit and the CSR fast path.
+        test_task10_dfs_sequence_batch: Tests inline multi-source activation against the oracle DFS.
+        test_task10_activation_pool_shared_memory: Tests pooled activation over the shared CSR block.
+        test_metrics_instrumentation: Tests opt-in call/latency/size/peak metrics and JSON export.
+        test_metrics_recursion: Tests that only the outermost recursive call is recorded.
+    """
+
+    def test_task1_extract_shards_batch(self):
+        streams = ["23noitazimitpO#gnirts_001#eman-tceles", "ahp!la#at?eb", "", "é$fac"]
+        self.assertEqual(extract_shards_batch(iter(streams)), [
+            ['Optimization32', '100_string', 'select-name'],
+            ['alpha', 'beta'],
+            [''],
+            ['café'],
+        ])
+
+    def test_task1_extract_shards_batch_pool(self):
+        streams = ["%d#@x%d" % (i, i) for i in range(300)]
+        result = extract_shards_batch(streams, workers=2, chunksize=16, parallel_threshold=100)
+        self.assertEqual(result, [[str(i)[::-1], str(i)[::-1] + "x"] for i in range(300)])
+
+    def test_task3_shard_registry(self):
+        shards = ['alpha', 'beta', 'gamma', 'alpha', 'beta']
+        codes = [7, 12, 18, 22, 3]
+        registry = ShardRegistry.from_streams(iter(shards), iter(codes))
+        self.assertEqual(registry.pairs(), [('alpha', 7), ('beta', 12), ('gamma', 18)])
+        self.assertEqual(ShardRegistry.from_streams(shards, codes, "last").pairs(),
+                         [('alpha', 22), ('beta', 3), ('gamma', 18)])
+        registry = ShardRegistry.from_streams(shards, codes, "min")
+        self.assertEqual(registry.pairs(), [('alpha', 7), ('beta', 3), ('gamma', 18)])
+        self.assertTrue(registry.add('delta', 40))
+        self.assertFalse(registry.add('delta', 1))
+        self.assertEqual(registry['delta'], 1)
+        self.assertEqual(len(registry), 4)
+        with self.assertRaises(ValueError):
+            ShardRegistry("random")
+
+    def test_task4_schedule_reconstruction(self):
+        pairs = [('alpha', 7), ('beta', 12), ('gamma', 18)]
+        self.assertEqual(schedule_reconstruction(pairs), [7, 12, 18])
+        info = {7: {"energy": 1.2}, 12: {"energy": 4.0}, 18: {"energy": 2.5}}
+        self.assertEqual(schedule_reconstruction(pairs, energy_priority(info)), [12, 18, 7])
+        mapping = {"7": ["18"], "12": ["18"], "18": ["12"]}
+        self.assertEqual(schedule_reconstruction(pairs, dependency_priority(mapping)), [18, 12, 7])
+        self.assertEqual(schedule_reconstruction(pairs, batch_size=2), [[7, 12], [18]])
+        repeated = [('a', 1), ('b', 1), ('c', 2)]
+        self.assertEqual(schedule_reconstruction(repeated), [1, 1, 2])
+        self.assertEqual(schedule_reconstruction(repeated, batch_size=5), [[1, 1, 2]])
+        self.assertEqual(schedule_reconstruction(iter(repeated), batch_size=2), [[1, 1], [2]])
+        shared = [('alpha', 7), ('beta', 7), ('gamma', 18)]
+        by_code = lambda pair: pair[1]
+        self.assertEqual(schedule_reconstruction(shared), [7, 7, 18])
+        self.assertEqual(schedule_reconstruction(shared, by_code), [7, 7, 18])
+        self.assertEqual(schedule_reconstruction(shared, by_code, batch_size=2), [[7, 7], [18]])
+        self.assertEqual(schedule_reconstruction(shared, lambda pair: -pair[1]), [18, 7, 7])
+        for key in (None, by_code):
+            with self.assertRaises(ValueError):
+                schedule_reconstruction(pairs, key, batch_size=0)
+
+    def test_task4_reconstruction_queue_updates(self):
+        queue = ReconstructionQueue([('alpha', 7), ('beta', 12), ('gamma', 18), ('delta', 22)],
+                                    key=lambda pair: pair[1])
+        queue.update(22, 0)
+        queue.remove(12)
+        self.assertNotIn(12, queue)
+        self.assertEqual(len(queue), 3)
+        self.assertEqual(queue.pop(), ('delta', 22))
+        queue.push(('alpha', 7), 100)
+        self.assertEqual(list(queue.drain(5)), [[('gamma', 18), ('alpha', 7)]])
+        with self.assertRaises(IndexError):
+            queue.pop()
+        with self.assertRaises(ValueError):
+            queue.pop_batch(0)
+        with self.assertRaises(ValueError):
+            next(queue.drain(0))
+
+    def test_task7_merge_sort_bottom_up(self):
+        self.assertEqual(merge_sort_energy_bottom_up([(18, 3.1), (7, 1.2), (12, 2.5)]),
+                         [(7, 1.2), (12, 2.5), (18, 3.1)])
+        self.assertEqual(merge_sort_energy_bottom_up([]), [])
+        rng = random.Random(3)
+        for data in ([(i, rng.randrange(50) / 10) for i in range(2000)],
+                     [(i, i / 10) for i in range(2000)],
+                     [(i, -i / 10) for i in range(2000)],
+                     [(i, 1.0) for i in range(500)]):
+            self.assertEqual(merge_sort_energy_bottom_up(data), sorted(data, key=lambda s: s[1]))
+
+    def test_task7_external_merge_sort(self):
+        rng = random.Random(5)
+        data = [(i, float(rng.randrange(20))) for i in range(1000)]
+        expected = sorted(data, key=lambda s: s[1])
+        self.assertEqual(list(external_merge_sort_energy(iter(data), run_size=64)), expected)
+        self.assertEqual(list(external_merge_sort_energy(data, run_size=5000)), expected)
+
+    def test_task8_quantum_stats_tree(self):
+        tree = QuantumStatsTree([(18, 3.1), (2, 0.9), (22, 4.0), (7, 1.2), (12, 2.5)])
+        self.assertEqual(tree.inorder(), [(2, 0.9), (7, 1.2), (12, 2.5), (18, 3.1), (22, 4.0)])
+        self.assertEqual(tree.kth_smallest(2), (12, 2.5))
+        self.assertEqual(tree.rank(2.5), 2)
+        self.assertEqual(tree.rank(10.0), 5)
+        self.assertEqual(tree.count_range(1.0, 3.1), 3)
+        self.assertEqual(tree.percentile(95), (22, 4.0))
+        self.assertEqual(tree.percentile(40), (7, 1.2))
+
+        sorted_tree = QuantumStatsTree((i, float(i)) for i in range(4096))
+        self.assertLessEqual(sorted_tree.root.height, 15)
+        self.assertEqual(sorted_tree.kth_smallest(4000), (4000, 4000.0))
+
+    def test_task8_quantum_stats_tree_delete(self):
+        rng = random.Random(11)
+        oracle = []
+        tree = QuantumStatsTree()
+        for i in range(600):
+            pair = (i % 40, float(rng.randrange(30)))
+            tree.insert(*pair)
+            oracle.append(pair)
+        oracle.sort(key=lambda pair: pair[1])
+        for _ in range(300):
+            code, energy = oracle[rng.randrange(len(oracle))]
+            self.assertTrue(tree.delete(code, energy))
+            oracle.remove((code, energy))
+        self.assertFalse(tree.delete(999, 1.0))
+        self.assertEqual(list(tree), oracle)
+        self.assertEqual(len(tree), 300)
+        self.assertEqual(tree.count_range(5.0, 9.0), sum(1 for _, e in oracle if 5.0 <= e <= 9.0))
+
+    def test_task8_tree_snapshot(self):
+        rng = random.Random(8)
+        pairs = sorted(((i, float(rng.randrange(30))) for i in range(400)), key=lambda pair: pair[1])
+        tree = QuantumStatsTree.from_sorted(pairs)
+        self.assertEqual(tree.inorder(), pairs)
+        self.assertEqual(tree.kth_smallest(200), pairs[200])
+        with self.assertRaises(ValueError):
+            QuantumStatsTree.from_sorted([(1, 2.0), (2, 1.0)])
+
+        root = QuantumNode(12, 2.5)
+        root.left, root.right = QuantumNode(7, 1.2), QuantumNode(18, 3.1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tree.snap")
+            save_tree_snapshot(tree, path)
+            loaded = load_tree_snapshot(path)
+            self.assertEqual(loaded.inorder(), pairs)
+            self.assertEqual(loaded.rank(10.0), tree.rank(10.0))
+            loaded.insert(999, pairs[0][1])
+            self.assertTrue(loaded.delete(pairs[0][0], pairs[0][1]))
+            self.assertEqual(loaded.kth_smallest(0)[1], pairs[0][1])
+
+            save_tree_snapshot(root, path)
+            self.assertEqual(load_tree_snapshot(path).inorder(), [(7, 1.2), (12, 2.5), (18, 3.1)])
+            with open(path, "r+b") as handle:
+                handle.seek(-1, os.SEEK_END)
+                handle.write(b"\xff")
+            with self.assertRaises(SnapshotError):
+                load_tree_snapshot(path)
+
+    def test_task9_shard_csr_graph(self):
+        mapping = {"7": ["12", "18"], "12": ["18"], "18": []}
+        graph = ShardCSRGraph.from_mapping(mapping)
+        self.assertEqual(dict(graph), mapping)
+        self.assertEqual(list(graph.offsets), [0, 2, 3, 3])
+        self.assertEqual(graph.edge_count, 3)
+        self.assertEqual(ShardCSRGraph.from_mapping({"1": ["2"]})["2"], [])
+
+    def test_task9_load_shard_graph(self):
+        text = '{"7": ["12", "18"]}\n{"12": ["18"], "30": []}\n  ["18", [7]]\n{"40": ["41"]}'
+        expected = {"7": ["12", "18"], "12": ["18"], "30": [], "18": ["7"], "40": ["41"], "41": []}
+        for chunk_size in (1, 5, 1 << 20):
+            graph = load_shard_graph(io.StringIO(text), chunk_size)
+            self.assertEqual(dict(graph), expected)
+            self.assertEqual(graph.codes[:3], ["7", "12", "18"])
+
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                for i in range(1000):
+                    handle.write('{"%d": ["%d"]}\n' % (i, i + 1))
+            graph = load_shard_graph(path, chunk_size=64)
+            self.assertEqual(len(graph), 1001)
+            self.assertEqual(graph["999"], ["1000"])
+        finally:
+            os.remove(path)
+
+        with self.assertRaises(ValueError):
+            load_shard_graph(io.StringIO('{"7": ["12"]} {"12": '))
+        for bad in ('42', '["7", "12"]', '{"7": "12"}', '{"7": null}', '{"7": ["12"]}\n{"12": {"18": []}}'):
+            with self.assertRaises(ValueError):
+                load_shard_graph(io.StringIO(bad))
+
+    def test_task9_graph_snapshot(self):
+        graph = {"7": ["12", "18"], "12": ["22"], "18": [], "22": ["7"], "δ": ["99"]}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.snap")
+            save_graph_snapshot(graph, path)
+            loaded = load_graph_snapshot(path)
+            self.assertEqual(dict(loaded), dict(graph, **{"99": []}))
+            self.assertEqual(loaded.offsets, ShardCSRGraph.from_mapping(graph).offsets)
+            self.assertEqual(dfs_sequence_batch(loaded, ["7"]), [["7", "12", "22", "18"]])
+            with self.assertRaises(SnapshotError):
+                load_tree_snapshot(path)
+
+            with open(path, "r+b") as handle:
+                header = bytearray(handle.read(48))
+                header[8] += 1  # version bump without fixing the header checksum
+                handle.seek(0)
+                handle.write(header)
+            with self.assertRaises(SnapshotError):
+                load_graph_snapshot(path)
+            with open(path, "wb") as handle:
+                handle.write(b"QV7SNAPS")
+            with self.assertRaises(SnapshotError):
+                load_graph_snapshot(path)
+            save_graph_snapshot({}, path)
+            self.assertEqual(len(load_graph_snapshot(path)), 0)
+            with self.assertRaises(ValueError):
+                save_graph_snapshot({7: [12]}, path)
+
+    def test_task10_shard_graph_cache(self):
+        graph = ShardGraph({"7": ["12"], "12": ["18"], "18": [], "30": ["31"]})
+        self.assertEqual(graph.dfs_sequence("7"),
+                         (['7', '12', '18'], "Quantum Vault fully restored. Protocol QV-7 complete."))
+        self.assertEqual(graph.activation_order("30"), ('30', '31'))
+        self.assertIs(graph.activation_order("7"), graph.activation_order("7"))
+
+        graph.add_edge("31", "40")
+        self.assertTrue(graph.is_cached("7"))
+        self.assertFalse(graph.is_cached("30"))
+        self.assertEqual(graph.activation_order("30"), ('30', '31', '40'))
+
+        graph.add_edge("12", "30")
+        self.assertFalse(graph.is_cached("7"))
+        self.assertTrue(graph.is_cached("30"))
+        self.assertEqual(graph.activation_order("7"), ('7', '12', '18', '30', '31', '40'))
+
+        graph.remove_edge("31", "40")
+        self.assertFalse(graph.is_cached("7"))
+        self.assertEqual(graph.activation_order("7"), ('7', '12', '18', '30', '31'))
+        with self.assertRaises(ValueError):
+            graph.remove_edge("7", "18")
+
+    def test_task10_plan_activation(self):
+        graph = {"7": ["12", "18"], "12": ["18", "22"], "18": ["22"], "22": [], "99": ["7"]}
+        costs = shard_energy_costs({'decode_7': {'energy': 1.2}, 'decode_12': {'energy': 0.5},
+                                    'validate_18': {'energy': 3.1}, 'decode_22': {'energy': 1.0},
+                                    'decode_99': {'energy': 9.9}})
+        self.assertEqual(costs["18"], 3.1)
+        for g in (graph, ShardCSRGraph.from_mapping(graph)):
+            best, parents = plan_activation(g, "7", costs)
+            self.assertEqual(set(best), {"7", "12", "18", "22"})
+            self.assertAlmostEqual(best["22"], 2.7)
+            self.assertAlmostEqual(best["18"], 4.3)
+            self.assertEqual(activation_path(parents, "22"), ["7", "12", "22"])
+            self.assertEqual(activation_path(parents, "99"), [])
+            self.assertEqual(plan_activation(g, "9", costs, default_cost=1.0), ({"9": 1.0}, {"9": None}))
+            with self.assertRaises(KeyError):
+                plan_activation(g, "9", costs)
+
+        best, parents = plan_activation(graph, "7", costs, target="12")
+        self.assertNotIn("22", best)
+        self.assertEqual(activation_path(parents, "12"), ["7", "12"])
+        with self.assertRaises(KeyError):
+            plan_activation({"1": ["2"]}, "1", {"1": 1.0})
+        self.assertEqual(plan_activation({"1": ["2"]}, "1", {"1": 1.0}, default_cost=0.0)[0], {"1": 1.0, "2": 1.0})
+
+        graph = {"7": ["12", "18"], "12": ["18"], "18": [], "99": ["7"]}
+        partial = {"7": 1.2, "12": 2.5, "18": 3.1}
+        for g in (graph, ShardCSRGraph.from_mapping(graph)):
+            self.assertEqual(plan_activation(g, "7", partial)[0], {"7": 1.2, "12": 3.7, "18": 4.3})
+
+    def test_task10_dfs_sequence_batch(self):
+        graph = {"7": ["12", "18"], "12": ["22"], "18": [], "22": []}
+        self.assertEqual(dfs_sequence_batch(graph, iter(["7", "18", "99", "12", "7"])),
+                         [['7', '12', '22', '18'], ['18'], ['99'], ['12', '22'], ['7', '12', '22', '18']])
+        self.assertEqual(dfs_sequence_batch(graph, []), [])
+
+        graph = make_graph(400, "random", 3)
+        starts = [str(i) for i in range(0, 400, 7)]
+        self.assertEqual(dfs_sequence_batch(ShardCSRGraph.from_mapping(graph), starts, workers=1),
+                         [oracle_dfs(graph, start) for start in starts])
+
+    def test_task10_activation_pool_shared_memory(self):
+        from multiprocessing import shared_memory
+        graph = make_graph(300, "random", 5)
+        starts = [str(i) for i in range(0, 300, 11)] + ["missing"]
+        expected = [oracle_dfs(graph, start) for start in starts]
+        with ActivationPool(graph, workers=2, chunksize=4, parallel_threshold=1) as pool:
+            self.assertEqual(pool.activate(starts), expected)
+            name = pool._block.name
+            self.assertEqual(pool.activate(reversed(starts)), expected[::-1])
+        self.assertIsNone(pool._block)
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+    def test_metrics_instrumentation(self):
+        reset_metrics()
+        shards = [(i, float(i % 5)) for i in range(500)]
+        protocol_qv7.merge_sort_energy_bottom_up(shards)
+        self.assertEqual(metrics_snapshot(), {})
+        self.assertIs(protocol_qv7.merge_sort_energy_bottom_up, merge_sort_energy_bottom_up)
+
+        with collect_metrics(trace_memory=True):
+            protocol_qv7.merge_sort_energy_bottom_up(shards)
+            protocol_qv7.merge_sort_energy_bottom_up(shards[:50])
+            protocol_qv7.schedule_reconstruction([("alpha", 7)], key=energy_priority({"alpha": 1.0}))
+        snapshot = metrics_snapshot()
+        self.assertEqual(set(snapshot), {"merge_sort_energy_bottom_up", "schedule_reconstruction"})
+        stats = snapshot["merge_sort_energy_bottom_up"]
+        self.assertEqual((stats["calls"], stats["input_items"], stats["max_input"]), (2, 550, 500))
+        self.assertLessEqual(stats["p50_seconds"], stats["p99_seconds"])
+        self.assertGreater(stats["peak_bytes"], 0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.json")
+            self.assertEqual(json.loads(export_metrics(path)), snapshot)
+            with open(path, encoding="utf-8") as handle:
+                self.assertEqual(json.load(handle), snapshot)
+
+        enable_metrics()
+        protocol_qv7.extract_shards_batch(["ahpla"])
+        disable_metrics()
+        self.assertEqual(metrics_snapshot()["extract_shards_batch"]["calls"], 1)
+        reset_metrics()
+        self.assertEqual(metrics_snapshot(), {})
+
+
+    def test_metrics_recursion(self):
+        def metrics_probe(depth):
+            return 0 if depth == 0 else 1 + protocol_qv7.metrics_probe(depth - 1)
+
+        protocol_qv7.metrics_probe = protocol_qv7.instrumented(metrics_probe)
+        self.addCleanup(delattr, protocol_qv7, "metrics_probe")
+        self.addCleanup(protocol_qv7._metrics_functions.pop, "metrics_probe")
+        reset_metrics()
+        self.assertEqual(protocol_qv7.metrics_probe(900), 900)  # unwrapped while disabled
+        with collect_metrics(trace_memory=True):
+            self.assertEqual(protocol_qv7.metrics_probe(300), 300)
+        stats = metrics_snapshot()["metrics_probe"]
+        self.assertEqual((stats["calls"], stats["max_input"]), (1, None))
+        self.assertIs(protocol_qv7.metrics_probe, metrics_probe)
+        reset_metrics()
+
+class TestProtocolQV7Differential(unittest.TestCase):
+    """Seeded differential tests of the Protocol QV-7 tasks and engines against reference oracles.
+
+    Methods:
+        test_task1_extract_shards_fuzz: Tests extract_shards against a character-filter oracle.
+        test_task7_merge_sort_energy_fuzz: Tests merge_sort_energy against sorted().
+        test_task8_insert_inorder_qv_fuzz: Tests insert_qv/inorder_qv against sorted().
+        test_task10_dfs_sequence_fuzz: Tests dfs_sequence against a naive stack DFS.
+        test_engines_match_oracles: Tests every benchmarked engine against its oracle.
+        test_benchmark_suite: Smoke-tests the harness and the throughput baseline check.
+    """
+    SEEDS = range(20)
+
+    def test_task1_extract_shards_fuzz(self):
+        for seed in self.SEEDS:
+            for kind in ("clean", "noisy"):
+                stream = make_streams(1 + seed * 3, kind, seed)
+                self.assertEqual(extract_shards(stream), oracle_extract_shards(stream), (kind, seed))
+
+    def test_task7_merge_sort_energy_fuzz(self):
+        for seed in self.SEEDS:
+            for kind in ("random", "sorted", "reversed", "duplicates"):
+                shards = make_energies(seed * 5, kind, seed)
+                self.assertEqual(merge_sort_energy(list(shards)), oracle_sort_energy(shards), (kind, seed))
+
+    def test_task8_insert_inorder_qv_fuzz(self):
+        for seed in self.SEEDS:
+            for kind in ("random", "duplicates"):
+                shards = make_energies(1 + seed * 5, kind, seed)
+                root = None
+                for code, energy in shards:
+                    root = insert_qv(root, code, energy)
+                self.assertEqual(inorder_qv(root), oracle_sort_energy(shards), (kind, seed))
+
+    def test_task10_dfs_sequence_fuzz(self):
+        for seed in self.SEEDS:
+            for kind in ("random", "chain"):
+                graph = make_graph(1 + seed * 5, kind, seed)
+                self.assertEqual(dfs_sequence(graph, "0"),
+                                 (oracle_dfs(graph, "0"), "Quantum Vault fully restored. Protocol QV-7 complete."),
+                                 (kind, seed))
+
+    def test_engines_match_oracles(self):
+        for name, (datasets, factory, engine, _, oracle) in bench_protocolqv7.BENCHMARKS.items():
+            for seed in range(5):
+                for kind in datasets:
+                    data = factory(1 + seed * 40, kind, seed)
+                    self.assertEqual(engine(data), oracle(data), (name, kind, seed))
+
+    def test_benchmark_suite(self):
+        current = bench_protocolqv7.run_benchmarks(sizes=[300], targets=("engine", "task"),
+                                                   repeat=1, trace_memory=False)
+        rows = current["results"]
+        self.assertEqual(len(rows), 22)
+        self.assertTrue(all(row["status"] == "ok" for row in rows if row["target"] == "engine"))
+        self.assertEqual(bench_protocolqv7.compare_results(current, current), [])
+
+        measured = [row for row in rows if row["status"] == "ok"]
+        faster = {"results": [dict(row, items_per_second=row["items_per_second"] * 10) for row in measured]}
+        self.assertEqual(len(bench_protocolqv7.compare_results(current, faster, tolerance=0.5)), len(measured))
+
+
+if __name__ == '__main__':
+    unittest.main()